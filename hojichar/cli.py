@@ -4,7 +4,7 @@ import json
 import logging
 import os
 import sys
-from typing import Callable, Iterator, Optional
+from typing import Callable, Iterator, List, Optional
 
 import tqdm
 
@@ -34,7 +34,7 @@ class ProgressBarIteratorWrapper:
         return next
 
 
-def argparser() -> argparse.Namespace:
+def argparser(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--profile",
@@ -95,14 +95,18 @@ def argparser() -> argparse.Namespace:
         action="version",
         version=hojichar.__version__,
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     return args
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point of the `hojichar` command.
+    `argv` defaults to `sys.argv[1:]`. Passing it runs the command in the current process.
+    """
     file_in = None
     file_out = None
-    args = argparser()
+    args = argparser(argv)
 
     input_iter: Iterator[str]
     if args.input:
@@ -1,12 +1,13 @@
 import json
 import logging
 import pprint
-from typing import Any, List, Optional, Union
+import time
+from typing import Any, Callable, List, Optional, Sequence, Union
 
 import numpy as np
 
 from hojichar.core.filter_interface import Filter, TokenFilter
-from hojichar.core.inspection import Inspector, StatisticsCounter, StatsContainer
+from hojichar.core.inspection import Inspector, StatisticsCounter, StatsContainer, _utf8_len
 from hojichar.core.models import Document
 
 
@@ -49,6 +50,7 @@ class Compose(Filter):
             for idx, filter in enumerate(self.filters)
         ]
         self._statistics = StatisticsCounter(self.inspectors)
+        self._stats_enabled = True
 
         # Turn random_state into a `np.random.Generator` instance.
         if random_state is None:
@@ -74,6 +76,21 @@ class Compose(Filter):
                 self.filters.extend(filter.filters)
             else:
                 self.filters.append(filter)
+        # Bound `apply_filter` methods of the filters, which are called for each document.
+        self._appliers = tuple(filter.apply_filter for filter in self.filters)
+        self._batch_appliers = tuple(_batch_applier(filter) for filter in self.filters)
+        # Index from which all the remaining filters skip rejected documents.
+        self._skip_tail_from = len(self.filters)
+        while self._skip_tail_from > 0 and self.filters[self._skip_tail_from - 1].skip_rejected:
+            self._skip_tail_from -= 1
+
+    def disable_statistics(self) -> None:
+        """
+        Stop collecting the statistics of the filters.
+        The documents are processed without inspecting them after each filter,
+        which saves the overhead when the statistics are not needed.
+        """
+        self._stats_enabled = False
 
     def __call__(self, text: str) -> str:
         document = Document(text)
@@ -83,33 +100,132 @@ class Compose(Filter):
         else:
             return document.text
 
-    def _apply_filter(self, filt: Union[Filter, TokenFilter], document: Document) -> Document:
-        if document.is_rejected and filt.skip_rejected:
-            pass
-        else:
-            if filt.p == 1:
-                document = filt.apply_filter(document)
-            else:
-                if self.rng.random() < filt.p:
-                    document = filt.apply_filter(document)
-        return document
-
     def apply(self, document: Document) -> Document:
-        document = self.before_process_inspector.apply(document)
+        return self._apply(document)
+
+    def apply_batch(self, batch: Sequence[Document]) -> List[Document]:
+        """
+        Apply the composed filters to a batch of documents.
+
+        Each filter is applied to the whole batch before the next one,
+        so that a filter overriding `apply_batch`, e.g. a model which accepts batched inputs,
+        processes the documents at once. The random numbers of a filter applied
+        with probability `p < 1` are drawn for the batch by a single call of the random generator.
+        """
+        docs = list(batch)
+        stats_enabled = self._stats_enabled
+        if stats_enabled:
+            started_ns = time.perf_counter_ns()
+            texts = [doc.text for doc in docs]
+            sizes = [_utf8_len(text) for text in texts]
+            input_bytes = sum(
+                size if text is doc.original else _utf8_len(doc.original)
+                for doc, text, size in zip(docs, texts, sizes)
+            )
+            # Whether each document is rejected after any of the filters.
+            ever_rejected = [doc.is_rejected for doc in docs]
+        for i, (filt, apply_batch) in enumerate(zip(self.filters, self._batch_appliers)):
+            skip_rejected = filt.skip_rejected
+            targets = [j for j, doc in enumerate(docs) if not (skip_rejected and doc.is_rejected)]
+            if filt.p < 1:
+                draws = self.rng.random(len(targets)).tolist()
+                targets = [j for j, draw in zip(targets, draws) if draw < filt.p]
+            if not targets:
+                continue
+
+            was_rejected = [docs[j].is_rejected for j in targets]
+            layer_started_ns = time.perf_counter_ns()
+            processed = apply_batch([docs[j] for j in targets])
+            layer_time_ns = time.perf_counter_ns() - layer_started_ns
+            discard_num = 0
+            diff_bytes = 0
+            for j, doc, rejected_before in zip(targets, processed, was_rejected):
+                docs[j] = doc
+                if not rejected_before and doc.is_rejected:
+                    doc.reject_reason = filt.get_jsonalbe_vars(exclude_keys={"skip_rejected"})
+                if not stats_enabled:
+                    continue
+                text = doc.text
+                size = sizes[j] if text is texts[j] else _utf8_len(text)
+                if not rejected_before and doc.is_rejected:
+                    discard_num += 1
+                    diff_bytes -= size
+                elif not rejected_before or not doc.is_rejected:
+                    diff_bytes += size - sizes[j]
+                texts[j] = text
+                sizes[j] = size
+                # The state before the first filter is not counted as rejected by a filter.
+                ever_rejected[j] = doc.is_rejected or (i > 0 and ever_rejected[j])
+            if stats_enabled:
+                self._statistics.update_layer(
+                    self.inspectors[i].target, discard_num, diff_bytes, layer_time_ns
+                )
+
+        if stats_enabled:
+            output_bytes = 0
+            if self.filters:
+                output_bytes = sum(size for doc, size in zip(docs, sizes) if not doc.is_rejected)
+            self._statistics.update_total(
+                processed_num=len(docs),
+                discard_num=sum(
+                    rejected or doc.is_rejected for doc, rejected in zip(docs, ever_rejected)
+                ),
+                input_bytes=input_bytes,
+                output_bytes=output_bytes,
+                time_ns=time.perf_counter_ns() - started_ns,
+                token_num=sum(len(doc.tokens) for doc in docs),
+            )
+        return docs
+
+    def _apply(self, document: Document) -> Document:
+        if not self._stats_enabled:
+            return self._apply_without_statistics(document)
+        self.before_process_inspector.inspect(document)
         previous_inspector = self.before_process_inspector
-        for i, filt in enumerate(self.filters):
-            inspector = self.inspectors[i]
-            document = self._apply_filter(filt=filt, document=document)
-            document = inspector.apply(document)
+        inspectors = self.inspectors
+        for i, (filt, apply_filter, inspector) in enumerate(
+            zip(self.filters, self._appliers, self.inspectors)
+        ):
+            if document.is_rejected and i >= self._skip_tail_from:
+                # None of the remaining filters processes the rejected document.
+                # Their statistics would not change, so they are not inspected.
+                inspectors = self.inspectors[:i]
+                break
+            if not (document.is_rejected and filt.skip_rejected):
+                if filt.p == 1 or self.rng.random() < filt.p:
+                    document = apply_filter(document)
+            inspector.inspect(document, previous_inspector)
             if (not previous_inspector.is_rejected) and inspector.is_rejected:
                 document.reject_reason = filt.get_jsonalbe_vars(exclude_keys={"skip_rejected"})
             previous_inspector = inspector
 
-        self._statistics.update_changes(document, self.before_process_inspector, self.inspectors)
+        self._statistics.update_changes(document, self.before_process_inspector, inspectors)
+        return document
+
+    def _apply_without_statistics(self, document: Document) -> Document:
+        for i, (filt, apply_filter) in enumerate(zip(self.filters, self._appliers)):
+            if document.is_rejected:
+                if i >= self._skip_tail_from:
+                    break
+                if filt.skip_rejected:
+                    continue
+            if filt.p == 1 or self.rng.random() < filt.p:
+                was_rejected = document.is_rejected
+                document = apply_filter(document)
+                if not was_rejected and document.is_rejected:
+                    document.reject_reason = filt.get_jsonalbe_vars(exclude_keys={"skip_rejected"})
         return document
 
     @property
     def statistics(self) -> dict:
+        """
+        Statistics of the processed documents, for the whole pipeline and for each filter.
+
+        Once a document is rejected and all the remaining filters have `skip_rejected=True`,
+        those filters are neither applied nor inspected. The document adds nothing to their
+        layer statistics, including `cumulative_time`, but is counted in the total statistics.
+        A filter with `skip_rejected=False` keeps the filters up to it inspected.
+        """
         return self._statistics.get_statistics()
 
     @property
@@ -136,3 +252,15 @@ class Compose(Filter):
             for layer in info:
                 print(f"[{layer['layer']}] {layer['name']}")
                 pprint.pprint(layer["doc"])
+
+
+def _batch_applier(filt: Union[Filter, TokenFilter]) -> Callable[[List[Document]], List[Document]]:
+    """
+    Return the function which applies the filter to a batch of documents.
+    `apply_batch` is used only when a filter overrides it, since the default implementation
+    calls `apply` and would bypass an overridden `apply_filter`.
+    """
+    if isinstance(filt, Filter) and type(filt).apply_batch is not Filter.apply_batch:
+        return filt.apply_batch
+    apply_filter = filt.apply_filter
+    return lambda docs: [apply_filter(doc) for doc in docs]
@@ -1,5 +1,5 @@
 import logging
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Sequence, Set
 
 from hojichar.core.models import Document, Token
 
@@ -90,6 +90,25 @@ class Filter:
         document = self.apply(document)
         return document
 
+    def apply_batch(self, batch: Sequence[Document]) -> List[Document]:
+        """Apply the filter to a batch of documents.
+
+        The default implementation calls `apply` for each document.
+        Override this method when the filter can process several documents
+        more efficiently at once, e.g., a model which accepts batched inputs.
+
+        Parameters
+        ----------
+        batch : Sequence[Document]
+            Input documents
+
+        Returns
+        -------
+        List[Document]
+            Processed documents
+        """
+        return [self.apply(document) for document in batch]
+
     def __call__(self, text: str) -> str:
         document = Document(text)
         document = self.apply(document)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import dataclasses
 import logging
 import time
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 from hojichar.core.filter_interface import Filter, TokenFilter
 from hojichar.core.models import Document
@@ -11,6 +11,19 @@ from hojichar.core.models import Document
 logger = logging.getLogger(__name__)
 
 
+def _utf8_len(text: str) -> int:
+    """
+    Return the byte length of the text encoded in UTF-8.
+    For ASCII text, which is the same as the number of characters, encoding is skipped.
+
+    >>> _utf8_len("hojichar")
+    8
+    >>> _utf8_len("ほうじ茶")
+    12
+    """
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
 class Inspector(Filter):
     def __init__(
         self, target_filter: Union[Filter, TokenFilter], filter_idx: int, *args: Any, **kwargs: Any
@@ -24,15 +37,26 @@ class Inspector(Filter):
         self.is_rejected = False
         self.text_hash = 0
         self.tokens_hash = 0
+        self.text = ""
+        self.bytes = 0
 
     def apply(self, document: Document) -> Document:
         self.inspect(document)
         return document
 
-    def inspect(self, document: Document) -> None:
-        self.is_rejected = False
+    def inspect(self, document: Document, previous: Optional[Inspector] = None) -> None:
+        """
+        Record the state of the document.
+        If the text is the same object as the one inspected by `previous`,
+        its byte length is reused instead of encoding the text again.
+        """
         self.is_rejected = document.is_rejected
-        self.bytes = len(document.text.encode("utf-8"))
+        text = document.text
+        if previous is not None and previous.text is text:
+            self.bytes = previous.bytes
+        else:
+            self.bytes = _utf8_len(text)
+        self.text = text
         self.time_ns = time.perf_counter_ns()
 
 
@@ -159,38 +183,66 @@ class StatisticsCounter:
     ) -> None:
 
         # Counting statistics for each filter
+        layers_info = self.stats.layers_info
         previous_inspector = before_process_inspector
-        for idx, inspector in enumerate(inspectors):
-            # Logging how many docs are discarded in each filter
-            if (not previous_inspector.is_rejected) and inspector.is_rejected:
-                self.stats.layers_info[inspector.target].discard_num += 1
-
-            # logging how much volume of docs are changed in each filter.
+        for inspector in inspectors:
+            layer_stats = layers_info[inspector.target]
             if (not previous_inspector.is_rejected) and inspector.is_rejected:
-                diff_bytes = -inspector.bytes
-            elif previous_inspector.is_rejected and inspector.is_rejected:
-                diff_bytes = 0
-            else:
-                diff_bytes = inspector.bytes - previous_inspector.bytes
-
-            self.stats.layers_info[inspector.target].diff_bytes += diff_bytes
+                # Logging how many docs are discarded in each filter
+                layer_stats.discard_num += 1
+                # logging how much volume of docs are changed in each filter.
+                layer_stats.diff_bytes -= inspector.bytes
+            elif not previous_inspector.is_rejected or not inspector.is_rejected:
+                layer_stats.diff_bytes += inspector.bytes - previous_inspector.bytes
 
-            process_time_ns = inspector.time_ns - previous_inspector.time_ns
-            self.stats.layers_info[inspector.target].cumulative_time_ns += process_time_ns
+            layer_stats.cumulative_time_ns += inspector.time_ns - previous_inspector.time_ns
 
             previous_inspector = inspector
 
         # Counting total statistics
-        self.stats.total_info.processed_num += 1
-        self.stats.total_info.discard_num += (
-            1 if any([inspector.is_rejected for inspector in inspectors]) > 0 else 0
-        )
-        self.stats.total_info.input_bytes += len(document.original.encode("utf-8"))
-        self.stats.total_info.output_bytes += (
-            0 if document.is_rejected else len(document.text.encode("utf-8"))
-        )
-        self.stats.total_info.cumulative_time_ns += inspectors[-1].time_ns - inspectors[0].time_ns
-        self.stats.total_info.total_token_num += len(document.tokens)
+        total_info = self.stats.total_info
+        total_info.processed_num += 1
+        if document.is_rejected or any(inspector.is_rejected for inspector in inspectors):
+            total_info.discard_num += 1
+        if before_process_inspector.text is document.original:
+            total_info.input_bytes += before_process_inspector.bytes
+        else:
+            total_info.input_bytes += _utf8_len(document.original)
+        if not document.is_rejected and inspectors:
+            # The last inspector has inspected the output text.
+            total_info.output_bytes += inspectors[-1].bytes
+        if inspectors:
+            total_info.cumulative_time_ns += inspectors[-1].time_ns - inspectors[0].time_ns
+        total_info.total_token_num += len(document.tokens)
+
+    def update_layer(self, target: str, discard_num: int, diff_bytes: int, time_ns: int) -> None:
+        """
+        Add the changes made by a filter to a batch of documents.
+        """
+        layer_stats = self.stats.layers_info[target]
+        layer_stats.discard_num += discard_num
+        layer_stats.diff_bytes += diff_bytes
+        layer_stats.cumulative_time_ns += time_ns
+
+    def update_total(
+        self,
+        processed_num: int,
+        discard_num: int,
+        input_bytes: int,
+        output_bytes: int,
+        time_ns: int,
+        token_num: int,
+    ) -> None:
+        """
+        Add the total changes made by the filters to a batch of documents.
+        """
+        total_info = self.stats.total_info
+        total_info.processed_num += processed_num
+        total_info.discard_num += discard_num
+        total_info.input_bytes += input_bytes
+        total_info.output_bytes += output_bytes
+        total_info.cumulative_time_ns += time_ns
+        total_info.total_token_num += token_num
 
     def get_statistics(self) -> dict:
         return self.stats.get_human_readable_values()
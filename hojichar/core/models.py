@@ -35,7 +35,8 @@ class Document:
             self.extras = extras
 
         self.dedup_lsh: List[str] = []
-        self.reject_reason: Dict[str, Any] = {}
+        # Set by Compose only when a filter rejects the document.
+        self.reject_reason: Optional[Dict[str, Any]] = None
 
     @property
     def original(self) -> str:
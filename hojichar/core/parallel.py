@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import functools
+import itertools
 import logging
 import multiprocessing
 import os
@@ -22,25 +23,42 @@ def _init_worker(filter: hojichar.Compose, ignore_errors: bool) -> None:
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     global PARALLEL_BASE_FILTER, WORKER_PARAM_IGNORE_ERRORS
     PARALLEL_BASE_FILTER = hojichar.Compose(copy(filter.filters))  # TODO random state treatment
+    if not filter._stats_enabled:
+        PARALLEL_BASE_FILTER.disable_statistics()
     WORKER_PARAM_IGNORE_ERRORS = ignore_errors
 
 
 def _worker(
-    doc: hojichar.Document,
-) -> tuple[hojichar.Document, int, StatsContainer, str | None]:
+    docs: list[hojichar.Document],
+) -> tuple[list[hojichar.Document], int, StatsContainer, list[str]]:
     global PARALLEL_BASE_FILTER, WORKER_PARAM_IGNORE_ERRORS
     ignore_errors = WORKER_PARAM_IGNORE_ERRORS
-    error_message = None
-    try:
-        result = PARALLEL_BASE_FILTER.apply(doc)
-    except Exception as e:
-        if ignore_errors:
+    error_messages: list[str] = []
+    if not ignore_errors:
+        results = PARALLEL_BASE_FILTER.apply_batch(docs)
+        return results, os.getpid(), PARALLEL_BASE_FILTER.statistics_obj, error_messages
+
+    # Each document is processed on its own, so that an error rejects only the failed document
+    # and the state of the filters is updated only once for each document.
+    results = []
+    for doc in docs:
+        try:
+            result = PARALLEL_BASE_FILTER.apply(doc)
+        except Exception as e:
             logger.error(e)
-            error_message = str(e)
+            error_messages.append(str(e))
             result = hojichar.Document("", is_rejected=True)
-        else:
-            raise e  # If we're not ignoring errors, let this one propagate
-    return result, os.getpid(), PARALLEL_BASE_FILTER.statistics_obj, error_message
+        results.append(result)
+    return results, os.getpid(), PARALLEL_BASE_FILTER.statistics_obj, error_messages
+
+
+def _chunked(docs: Iterator[hojichar.Document], size: int) -> Iterator[list[hojichar.Document]]:
+    docs = iter(docs)
+    while True:
+        chunk = list(itertools.islice(docs, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class Parallel:
@@ -59,7 +77,13 @@ class Parallel:
     """
 
     def __init__(
-        self, filter: hojichar.Compose, num_jobs: int | None = None, ignore_errors: bool = False
+        self,
+        filter: hojichar.Compose,
+        num_jobs: int | None = None,
+        ignore_errors: bool = False,
+        chunksize: int = 64,
+        ordered: bool = False,
+        start_method: str | None = None,
     ):
         """
         Initializes a new instance of the Parallel class.
@@ -78,17 +102,35 @@ class Parallel:
                 the processing of a document will be caught and logged, but will not
                 stop the processing of further documents. If set to False, the first
                 exception thrown will terminate the entire parallel processing operation.
+                With this option, the documents are processed one by one to isolate the errors,
+                instead of applying each filter to the whole chunk by `apply_batch`.
+                Defaults to False.
+            chunksize (int, optional): The number of documents sent to a worker process
+                at once. Documents and statistics are passed between the processes per chunk,
+                which amortizes the inter-process communication overhead. Defaults to 64.
+            ordered (bool, optional): If set to True, the processed documents are yielded
+                in the order of the input. Otherwise, they are yielded in the order of completion,
+                so that a slow chunk does not hold back the chunks finished after it.
                 Defaults to False.
+            start_method (str | None, optional): The start method of the worker processes,
+                e.g. "fork", "spawn" or "forkserver". If None, the default start method of
+                `multiprocessing` is used. With "fork", the workers inherit the filter and
+                the state built by it, such as loaded models, instead of receiving a pickled copy.
+                Note that forking a process which runs threads may cause deadlocks.
+                Defaults to None.
         """
         self.filter = filter
         self.num_jobs = num_jobs
         self.ignore_errors = ignore_errors
+        self.chunksize = chunksize
+        self.ordered = ordered
+        self.start_method = start_method
 
         self._pool: multiprocessing.pool.Pool | None = None
         self._pid_stats: dict[int, StatsContainer] | None = None
 
     def __enter__(self) -> Parallel:
-        self._pool = multiprocessing.Pool(
+        self._pool = multiprocessing.get_context(self.start_method).Pool(
             processes=self.num_jobs,
             initializer=_init_worker,
             initargs=(self.filter, self.ignore_errors),
@@ -117,12 +159,16 @@ class Parallel:
             raise RuntimeError(
                 "Parallel instance not properly initialized. Use within a 'with' statement."
             )
+        # `Pool.imap` keeps the chunks completed ahead of their turn until they can be yielded.
+        imap = self._pool.imap if self.ordered else self._pool.imap_unordered
         try:
-            for doc, pid, stats_obj, err_msg in self._pool.imap_unordered(_worker, docs):
+            for processed_docs, pid, stats_obj, err_msgs in imap(
+                _worker, _chunked(docs, self.chunksize)
+            ):
                 self._pid_stats[pid] = stats_obj
-                if err_msg is not None:
-                    logger.error(f"Error in worker {pid}: {err_msg}")
-                yield doc
+                for err_msg in err_msgs:
+                    logger.error("Error in worker %s: %s", pid, err_msg)
+                yield from processed_docs
         except Exception:
             self.__exit__(None, None, None)
             raise
@@ -1,9 +1,24 @@
 """
 文書の(近似)重複処理のためのモジュール.
 """
-import copy
+
+import re
 from os import PathLike
-from typing import Any, Callable, List, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSet,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 
 try:
     import mmh3
@@ -15,6 +30,165 @@ except ImportError:
 from hojichar.core.filter_interface import Filter
 from hojichar.core.models import Document
 
+_MURMUR_C1 = np.uint32(0xCC9E2D51)
+_MURMUR_C2 = np.uint32(0x1B873593)
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+_HEX4_SHIFTS = np.array([12, 8, 4, 0], dtype=np.int64)
+
+
+def _rotl32(x: np.ndarray, r: int) -> np.ndarray:
+    return (x << np.uint32(r)) | (x >> np.uint32(32 - r))
+
+
+def _min_murmurhash3_32(keys: List[bytes], seeds: np.ndarray, rows: int = 1024) -> np.ndarray:
+    """
+    `keys` の各要素の MurmurHash3 (x86, 32bit, 符号付き) を `seeds` の各シードで計算し,
+    シードごとの最小値を返します. 値は `mmh3.hash(key, seed, signed=True)` と一致します.
+    シードの次元を NumPy の配列演算でまとめて計算するため, シードごとに Python から
+    mmh3 を呼び出すより高速です. バイト長の等しいキーを `rows` 個ずつまとめて処理します.
+
+    >>> _min_murmurhash3_32([b"hojichar", "ほうじ茶".encode()], np.arange(3, dtype=np.uint32))
+    array([-1737175663, -2078364972, -2113550737], dtype=int32)
+    """
+    minhash: np.ndarray = _min_murmurhash3_32_batch([keys], seeds, rows)[0]
+    return minhash
+
+
+def _min_murmurhash3_32_batch(
+    keys_of_docs: List[List[bytes]], seeds: np.ndarray, rows: int = 1024
+) -> np.ndarray:
+    """
+    `_min_murmurhash3_32` を複数の文書のキーに対して計算し, (文書数, シード数) の配列を返します.
+    バイト長の等しいキーは文書をまたいでまとめて計算するため, 短い文書が多い場合に高速です.
+    """
+    keys_by_length: Dict[int, Tuple[List[bytes], List[int]]] = {}
+    for doc_idx, keys in enumerate(keys_of_docs):
+        for key in keys:
+            group_keys, group_doc_ids = keys_by_length.setdefault(len(key), ([], []))
+            group_keys.append(key)
+            group_doc_ids.append(doc_idx)
+
+    minhash = np.full((len(keys_of_docs), len(seeds)), np.iinfo(np.int32).max, dtype=np.int32)
+    for length, (group, group_doc_ids) in keys_by_length.items():
+        data = np.frombuffer(b"".join(group), dtype=np.uint8).reshape(len(group), length)
+        doc_ids = np.array(group_doc_ids)
+        n_blocks = length // 4
+        blocks = data[:, : n_blocks * 4].copy().view("<u4")
+        tail = data[:, n_blocks * 4 :].astype(np.uint32)
+        for start in range(0, len(group), rows):
+            # h[i, j] は i 番目のキーの j 番目のシードでのハッシュ値
+            h = np.repeat(seeds[None, :], min(rows, len(group) - start), axis=0)
+            for i in range(n_blocks):
+                k = _rotl32(blocks[start : start + rows, i] * _MURMUR_C1, 15) * _MURMUR_C2
+                h ^= k[:, None]
+                h = _rotl32(h, 13) * np.uint32(5) + np.uint32(0xE6546B64)
+            if tail.shape[1] > 0:
+                k = np.zeros(h.shape[0], dtype=np.uint32)
+                for i in range(tail.shape[1]):
+                    k |= tail[start : start + rows, i] << np.uint32(8 * i)
+                k = _rotl32(k * _MURMUR_C1, 15) * _MURMUR_C2
+                h ^= k[:, None]
+            h ^= np.uint32(length)
+            h ^= h >> np.uint32(16)
+            h *= np.uint32(0x85EBCA6B)
+            h ^= h >> np.uint32(13)
+            h *= np.uint32(0xC2B2AE35)
+            h ^= h >> np.uint32(16)
+            # キーは文書順に並んでいるため, 文書ごとの区間で最小値をとる
+            chunk_doc_ids = doc_ids[start : start + rows]
+            offsets = np.flatnonzero(np.diff(chunk_doc_ids, prepend=-1))
+            targets = chunk_doc_ids[offsets]
+            chunk_minhash = np.minimum.reduceat(h.view(np.int32), offsets, axis=0)
+            minhash[targets] = np.minimum(minhash[targets], chunk_minhash)
+    return minhash
+
+
+def _hex4_of_fingerprints(fingerprints: np.ndarray) -> str:
+    """
+    各 fingerprint の `format(fp, "04x")[-4:]` を連結した文字列を返します.
+    負の値は符号と絶対値の16進数表記になるため, 絶対値の下位16bitを用います.
+
+    >>> _hex4_of_fingerprints(np.array([0x1234ABCD, -0x1234ABCD, 0xA], dtype=np.int32))
+    'abcdabcd000a'
+    >>> _hex4_of_fingerprints(np.array([-0xA], dtype=np.int32))
+    '-00a'
+    """
+    if ((fingerprints < 0) & (fingerprints > -0x1000)).any():
+        # 絶対値が小さい負の値は '-00a' のように符号を含むため, 個別に変換する
+        return "".join(format(fp, "04x")[-4:] for fp in fingerprints.tolist())
+    low16 = np.abs(fingerprints.astype(np.int64)) & 0xFFFF
+    digits = (low16[:, None] >> _HEX4_SHIFTS) & 0xF
+    hex4: str = _HEX_DIGITS[digits].tobytes().decode("ascii")
+    return hex4
+
+
+# `_lsh_to_key` で整数に変換できるハッシュ値の形式. バケット番号は 32 bit に収まる範囲に限る.
+_LSH_PATTERN = re.compile(r"(0|[1-9][0-9]{0,8})\+([0-9a-f]+)")
+
+
+def _lsh_to_key(lsh: str) -> Union[int, str]:
+    """
+    `GenerateDedupLSH` が生成した '<バケット番号>+<16進数>' 形式のハッシュ値を整数に変換します.
+    整数は同じ内容の文字列より小さく, 大量のハッシュ値を集合に保持する際のメモリを削減できます.
+    16進数の先頭に 1 を付けて先頭の 0 を保存するため, 変換は単射であり,
+    整数の一致は元の文字列の一致と同値です. 形式に合わない文字列はそのまま返します.
+
+    >>> _lsh_to_key("3+00ab") == _lsh_to_key("3+ab")
+    False
+    >>> _lsh_to_key("3+-00a")
+    '3+-00a'
+    """
+    match = _LSH_PATTERN.fullmatch(lsh)
+    if match is None:
+        return lsh
+    bucket, digest = match.groups()
+    return int("1" + digest, 16) << 32 | int(bucket)
+
+
+def _key_to_lsh(key: Union[int, str]) -> str:
+    """
+    `_lsh_to_key` の逆変換です.
+
+    >>> _key_to_lsh(_lsh_to_key("3+00ab"))
+    '3+00ab'
+    >>> _key_to_lsh("3+-00a")
+    '3+-00a'
+    """
+    if isinstance(key, str):
+        return key
+    return f"{key & 0xFFFFFFFF}+{format(key >> 32, 'x')[1:]}"
+
+
+class _LSHSet(MutableSet[str]):
+    """
+    ハッシュ値の文字列の集合です. メモリを削減するため, 内部では `_lsh_to_key` で整数に変換して保持し,
+    追加・検索の際に文字列を変換します. 要素を取り出す際は元の文字列に戻します.
+    """
+
+    def __init__(self, lshs: Iterable[str] = ()) -> None:
+        self._keys: Set[Union[int, str]] = {_lsh_to_key(lsh) for lsh in lshs}
+
+    def __contains__(self, lsh: object) -> bool:
+        return isinstance(lsh, str) and _lsh_to_key(lsh) in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return (_key_to_lsh(key) for key in self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def add(self, lsh: str) -> None:
+        self._keys.add(_lsh_to_key(lsh))
+
+    def discard(self, lsh: str) -> None:
+        self._keys.discard(_lsh_to_key(lsh))
+
+    def update(self, lshs: Iterable[str]) -> None:
+        self._keys.update(_lsh_to_key(lsh) for lsh in lshs)
+
 
 class GenerateDedupLSH(Filter):
     """
@@ -46,6 +220,7 @@ Please install it by `pip install 'hojichar[all]'` or `pip install mmh3`."
         self.N_GRAM = n_gram
         self.N_BUCKETS = n_buckets
         self.BUCKET_SIZE = bucket_size
+        self._seeds = np.arange(n_minhash, dtype=np.uint32)
 
     @staticmethod
     def n_gram_tokenize(text: str, n: int) -> List[str]:
@@ -88,32 +263,24 @@ Please install it by `pip install 'hojichar[all]'` or `pip install mmh3`."
             先頭2文字は何番目のハッシュ値かを表す.
             これにより, 重複処理ハッシュを一つのハッシュテーブルにプールすることで重複処理ができる.
         """
+        # 各 fingerprint 16進数表記にして, 下四桁をバケットサイズ個ずつ連結している
+        return self._split_into_buckets(_hex4_of_fingerprints(self._calc_fingerprints(text)))
+
+    def _calc_fingerprints(self, text: str) -> np.ndarray:
         # N_MINHASH 個の mmh3 ハッシュ値 から最終的に N_BUKET 個の重複処理ハッシュを計算する
-        fingerprints = []
-        for seed in range(self.N_MINHASH):
-            hashfunc = self.hashfunc_signed_32_from_seed(seed)
-            minhash = self.get_minhash(self.n_gram_tokenize(text, n=self.N_GRAM), hashfunc)
-            fingerprints.append(minhash)
+        # 各シードでの最小値は `get_minhash(tokens, hashfunc_signed_32_from_seed(seed))` と等しい.
+        # 重複する n-gram は最小値に影響しないため, 一度だけハッシュを計算する.
+        return _min_murmurhash3_32(self._encoded_ngrams(text), self._seeds)
 
-        # 速度のためにリスト内包で書いており, 可読性低め
-        # 各 fingerprint 16進数表記にして, 下四桁をバケットサイズ個ずつ連結している
-        # TODO Python だとオーバーヘッドが大きいので, C++ で実装しなおす
-        lshs = []
-        for bucket_idx in range(self.N_BUCKETS):
-            lshs.append(
-                str(bucket_idx)
-                + "+"
-                + "".join(
-                    [
-                        format(fingerprints[fp_idx], "04x")[-4:]  # 下四桁をtrim
-                        for fp_idx in range(
-                            bucket_idx * self.BUCKET_SIZE, (bucket_idx + 1) * self.BUCKET_SIZE
-                        )
-                    ]
-                )
-            )
+    def _encoded_ngrams(self, text: str) -> List[bytes]:
+        return [token.encode("utf-8") for token in set(self.n_gram_tokenize(text, n=self.N_GRAM))]
 
-        return lshs
+    def _split_into_buckets(self, hex4: str) -> List[str]:
+        width = 4 * self.BUCKET_SIZE
+        return [
+            f"{bucket_idx}+{hex4[bucket_idx * width : (bucket_idx + 1) * width]}"
+            for bucket_idx in range(self.N_BUCKETS)
+        ]
 
     def apply(self, doc: Document) -> Document:
         """
@@ -198,6 +365,23 @@ Please install it by `pip install 'hojichar[all]'` or `pip install mmh3`."
         doc.dedup_lsh = lshs
         return doc
 
+    def apply_batch(self, batch: Sequence[Document]) -> List[Document]:
+        """
+        バッチ内の全文書の fingerprint を1つの配列にまとめて計算し, 16進数表記への変換もまとめて行います.
+        """
+        docs = list(batch)
+        if len(docs) == 0:
+            return docs
+
+        fingerprints = _min_murmurhash3_32_batch(
+            [self._encoded_ngrams(doc.text) for doc in docs], self._seeds
+        )
+        hex4 = _hex4_of_fingerprints(fingerprints.ravel())
+        width = 4 * self.N_MINHASH
+        for doc_idx, doc in enumerate(docs):
+            doc.dedup_lsh = self._split_into_buckets(hex4[doc_idx * width : (doc_idx + 1) * width])
+        return docs
+
 
 class LSHDeduplicator(Filter):
     """
@@ -224,15 +408,18 @@ class LSHDeduplicator(Filter):
         super().__init__(*args, **kwargs)
         self.online_dedup = online_dedup
         self.store_blacklist = store_blacklist
-        self.seen = set()
+        self.seen: MutableSet[str] = _LSHSet()
+        loaded_lshs: Set[str] = set()
         if blacklist_path:
             with open(blacklist_path) as fp:
                 for line in fp:
                     lsh = line.strip()
                     self.seen.add(lsh)
+                    if store_blacklist:
+                        loaded_lshs.add(lsh)
 
         if store_blacklist:
-            self.blacklist = copy.copy(self.seen)
+            self.blacklist = loaded_lshs
 
     def apply(self, doc: Document) -> Document:
         """
@@ -254,13 +441,20 @@ class LSHDeduplicator(Filter):
                     `GenerateDedupLSH` must be composed before this filter."
             )
 
-        for lsh in lshs:
-            if lsh in self.seen:
+        # 既定の集合では, 整数に変換したキーで内部の集合を直接参照する.
+        seen: MutableSet[Any]
+        keys: Sequence[Any]
+        if isinstance(self.seen, _LSHSet):
+            seen, keys = self.seen._keys, [_lsh_to_key(lsh) for lsh in lshs]
+        else:
+            seen, keys = self.seen, lshs
+        for lsh, key in zip(lshs, keys):
+            if key in seen:
                 doc.is_rejected = True
                 if self.store_blacklist:
                     self.blacklist.add(lsh)
 
             if self.online_dedup:
-                self.seen.add(lsh)
+                seen.add(key)
 
         return doc
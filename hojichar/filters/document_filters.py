@@ -3,12 +3,12 @@ import logging
 import pathlib
 import re
 import string
+import sys
 import time
 import unicodedata
 from collections import Counter
-from itertools import groupby
 from os import PathLike
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -24,6 +24,13 @@ try:
 except ImportError:
     is_loaded_extras = False
 
+try:
+    import orjson
+
+    is_loaded_orjson = True
+except ImportError:
+    is_loaded_orjson = False
+
 BASE_PATH = pathlib.Path(hojichar.__path__[0])
 logger = logging.getLogger(__name__)
 
@@ -126,10 +133,47 @@ class DocumentNormalizer(Filter):
         super().__init__(*args, **kwargs)
 
     def apply(self, document: Document) -> Document:
+        """
+        >>> DocumentNormalizer()("ｈｏｊｉｃｈａｒ")
+        'hojichar'
+        """
+        # ASCII text is invariant under NFKC.
+        if document.text.isascii():
+            return document
         document.text = unicodedata.normalize("NFKC", document.text)
         return document
 
 
+def _json_loads(text: str) -> Any:
+    """
+    `orjson` がインストールされていれば, それを用いて JSON をパースします.
+    `orjson` が受け付けない入力 (NaN, 64bit を超える整数, サロゲート文字など) は
+    標準の `json` で読み直すため, 結果と例外は `json.loads` と同一になります.
+    """
+    if is_loaded_orjson:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _json_dumps_text(text: str) -> str:
+    """
+    `{"text": text}` を `json.dumps(..., ensure_ascii=False)` と同一の文字列に変換します.
+    `orjson` がインストールされていれば, 文字列のエスケープに用います.
+
+    >>> print(_json_dumps_text('ほうじ茶 "hojichar"'))
+    {"text": "ほうじ茶 \\"hojichar\\""}
+    """
+    if is_loaded_orjson:
+        try:
+            return '{"text": ' + orjson.dumps(text).decode("utf-8") + "}"
+        except TypeError:  # orjson はサロゲート文字を含む文字列を扱えない
+            pass
+    return json.dumps({"text": text}, ensure_ascii=False)
+
+
 class JSONLoader(Filter):
     """
     テキストを Json として解釈し, `key` で指定した要素を文字列として
@@ -172,12 +216,12 @@ class JSONLoader(Filter):
         True
         """
         try:
-            data = json.loads(document.text)
+            data = _json_loads(document.text)
             document.text = str(data[self.key])
             if self.extra_keys is not None:
                 document.extras = {key: data[key] for key in self.extra_keys if key in data}
         except Exception as e:
-            logger.error(f"Failed to parsing in JSONLoader. Input document: \n{document.text}")
+            logger.error("Failed to parsing in JSONLoader. Input document: \n%s", document.text)
             if self.ignore:
                 document.is_rejected = True
                 return document
@@ -223,12 +267,12 @@ class JSONDumper(Filter):
                 {
                     "text": text,
                     "is_rejected": document.is_rejected,
-                    "reason": document.reject_reason,
+                    "reason": document.reject_reason or {},
                 },
                 ensure_ascii=False,
             )
         else:
-            document.text = json.dumps({"text": text}, ensure_ascii=False)
+            document.text = _json_dumps_text(text)
         return document
 
 
@@ -265,6 +309,62 @@ class DocumentLengthFilter(Filter):
         return doc
 
 
+def _trie_pattern(words: List[str]) -> str:
+    """
+    単語のリストのいずれかにマッチする正規表現を, 共通の接頭辞をまとめたトライの形で構築します.
+    単語を `|` で並べたパターンでは各位置ですべての単語を順に試しますが,
+    トライの形では先頭の文字が一致する単語だけを試すため, 大きな辞書での検索が速くなります.
+    マッチする文字列の集合は単語を `|` で並べたパターンと同じです.
+
+    >>> _trie_pattern(["ab", "abc", "b"])
+    '(?:ab(?:c)?|b)'
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # 単語の終端
+
+    def to_pattern(node: Dict[str, dict]) -> str:
+        alternatives = [
+            re.escape(char) + to_pattern(child) for char, child in node.items() if char
+        ]
+        if len(alternatives) == 0:
+            return ""
+        if len(alternatives) == 1 and "" not in node:
+            return alternatives[0]
+        pattern = "(?:" + "|".join(alternatives) + ")"
+        return pattern + "?" if "" in node else pattern
+
+    return to_pattern(trie)
+
+
+# コンパイル済みの NG ワードのパターン. (辞書ファイルの絶対パス, 更新時刻 (ns), パターンの種類) をキーとする.
+# 辞書ファイルが更新されない限り, 同じ辞書を使うフィルタはパターンを共有する.
+_NG_WORDS_PATTERN_CACHE: Dict[Tuple[str, int, str], "re.Pattern[str]"] = {}
+
+
+def _load_ng_words_pattern(
+    dict_path: Union[str, PathLike],
+    kind: str,
+    compile_pattern: Callable[[List[str]], "re.Pattern[str]"],
+) -> "re.Pattern[str]":
+    """
+    `dict_path` のファイルから読み込んだ NG ワードのリストを `compile_pattern` でパターンに変換します.
+    変換結果は `kind` ごとにキャッシュされ, 2回目以降はファイルの読み込みとコンパイルを省略します.
+    """
+    path = pathlib.Path(dict_path)
+    key = (str(path.resolve()), path.stat().st_mtime_ns, kind)
+    pattern = _NG_WORDS_PATTERN_CACHE.get(key)
+    if pattern is None:
+        with open(path, encoding="utf-8") as fp:
+            ng_words = fp.read().split("\n")
+        pattern = compile_pattern([w for w in ng_words if not len(w) == 0])
+        _NG_WORDS_PATTERN_CACHE[key] = pattern
+    return pattern
+
+
 class NgWordsFilterJa(Filter):
     """
     日本語のNGワード(および不適切語)を含む文書を破棄します.
@@ -284,27 +384,31 @@ class NgWordsFilterJa(Filter):
         **kwargs: Any,
     ) -> None:
         super().__init__(*args, **kwargs)
+        self.keyword_pat = _load_ng_words_pattern(
+            dict_path,
+            "ja_ignore_confused" if ignore_confused else "ja",
+            lambda ng_words: self._compile_keyword_pat(ng_words, ignore_confused),
+        )
 
-        with open(dict_path, encoding="utf-8") as fp:
-            ng_words = fp.read().split("\n")
-        ng_words = [w.strip() for w in ng_words if not len(w) == 0]
+    @staticmethod
+    def _compile_keyword_pat(ng_words: List[str], ignore_confused: bool) -> "re.Pattern[str]":
+        ng_words = [w.strip() for w in ng_words]
 
         if ignore_confused:
             words_katakana = []
             words_not_katakana = []
             for w in ng_words:
                 if re.fullmatch(r"[ァ-ヴー]+", w):
-                    words_katakana.append(re.escape(w))
+                    words_katakana.append(w)
                 else:
-                    words_not_katakana.append(re.escape(w))
-            katakana_pat = "|".join(words_katakana)
+                    words_not_katakana.append(w)
+            katakana_pat = _trie_pattern(words_katakana)
             katakana_pat = rf"(?<![ァ-ヴー])({katakana_pat})(?![ァ-ヴー])"
-            pat = "|".join(words_not_katakana) + "|" + katakana_pat
-            self.keyword_pat = re.compile(pat)
+            pat = _trie_pattern(words_not_katakana) + "|" + katakana_pat
+            return re.compile(pat)
         else:
-            ng_words = [re.escape(w) for w in ng_words]
-            pat = "|".join(ng_words)
-            self.keyword_pat = re.compile(pat)
+            pat = _trie_pattern(ng_words)
+            return re.compile(pat)
 
     def apply(self, doc: Document) -> Document:
         regex_match = self.keyword_pat.search(doc.text)
@@ -327,13 +431,13 @@ class NgWordsFilterEn(Filter):
 
     def __init__(self, dict_path: Union[str, PathLike], *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
+        self.keyword_pat = _load_ng_words_pattern(dict_path, "en", self._compile_keyword_pat)
 
-        with open(dict_path, encoding="utf-8") as fp:
-            ng_words = fp.read().split("\n")
-        ng_words = [re.escape(w.strip()) for w in ng_words if not len(w) == 0]
-        pat = "|".join(ng_words)
+    @staticmethod
+    def _compile_keyword_pat(ng_words: List[str]) -> "re.Pattern[str]":
+        pat = _trie_pattern([w.strip() for w in ng_words])
         # 英語のパターンにマッチするようにしている, \s[単語]\s や [単語]. [単語], などにマッチ.
-        self.keyword_pat = re.compile(rf"(?:^| )({pat})(?:( |,|\.)|$)", re.IGNORECASE)
+        return re.compile(rf"(?:^| )({pat})(?:( |,|\.)|$)", re.IGNORECASE)
 
     def apply(self, doc: Document) -> Document:
         if self.keyword_pat.search(doc.text):
@@ -567,7 +671,6 @@ class DiscardRareKuten(Filter):
         super().__init__(*args, **kwargs)
 
         self.max_average_sentence_length = max_average_sentence_length
-        self.kuten_pat = re.compile(r"。")
 
     def apply(self, doc: Document) -> Document:
         """
@@ -576,9 +679,10 @@ class DiscardRareKuten(Filter):
         >>> DiscardRareKuten(max_average_sentence_length=4).apply(Document("おはよう。")).is_rejected
         True
         """
-        kuten_lst = self.kuten_pat.findall(doc.text)
+        # 句点は固定の1文字なので, 正規表現でリストを作らずに数える
+        kuten_num = doc.text.count("。")
         min_kuten_num = len(doc.text) / self.max_average_sentence_length
-        if len(kuten_lst) < min_kuten_num:
+        if kuten_num < min_kuten_num:
             doc.is_rejected = True
         return doc
 
@@ -687,8 +791,13 @@ class MaskPersonalInformation(Filter):
         >>> MaskPersonalInformation()('何かあれば hogehoge@example.ne.jp まで連絡')
         '何かあれば xxxx@yyy.jp まで連絡'
         """
-        text = self.phone_pat.sub(r"\1XXXX", doc.text)
-        text = self.email_pat.sub(r"xxxx@yyy\1", text)
+        text = doc.text
+        # Every phone number match starts with "0" or "+", and every email match contains "@".
+        # The regex substitutions, which scan the whole text, are skipped when they cannot match.
+        if "0" in text or "+" in text:
+            text = self.phone_pat.sub(r"\1XXXX", text)
+        if "@" in text:
+            text = self.email_pat.sub(r"xxxx@yyy\1", text)
         doc.text = text
         return doc
 
@@ -733,9 +842,10 @@ class DiscardTooManyNouns(Filter):
         # because they often decrease the noun ratio,
         # e.g., the sentence "リンゴ・オレンジ・バナナ・" has 補助記号 ratio of 0.5
         # however, we don't want such sentence
-        pos_count = Counter(
-            w.feature.pos1 for w in self.tagger(doc.text) if w.feature.pos1 != "補助記号"
-        )
+        # The first field of the raw feature string is pos1. Reading it directly avoids
+        # parsing all the unidic feature fields of every word.
+        pos_count = Counter(w.feature_raw.split(",", 1)[0] for w in self.tagger(doc.text))
+        del pos_count["補助記号"]
         try:
             noun_ratio = pos_count["名詞"] / sum(pos_count.values())
         except ZeroDivisionError:
@@ -868,19 +978,16 @@ class WordRepetitionRatioFilter(Filter):
         return doc
 
     def compute_word_repetition_ratio(self, document: str, word_repetition_length: int) -> float:
-        def get_freq_word_ngrams(document: str, n: int) -> Dict[str, int]:
+        def get_freq_word_ngrams(document: str, n: int) -> Counter:
             # tokenizing given document
             words = [w.surface for w in self.tagger(document)]
-            word_ngrams = [" ".join(words[i : i + n]) for i in range(len(words) - n + 1)]
-            freq_word_ngrams: Dict[str, int] = {}
-            for word_ngram in word_ngrams:
-                freq_word_ngrams[word_ngram] = freq_word_ngrams.get(word_ngram, 0) + 1
-            return freq_word_ngrams
+            # n-grams are counted as tuples of words, without joining them into strings
+            return Counter(zip(*(words[i:] for i in range(n))))
 
         freq_word_ngrams_dict = get_freq_word_ngrams(document, word_repetition_length)
         if len(freq_word_ngrams_dict) == 0:
             return 0
-        freq_word_ngrams = list(freq_word_ngrams_dict.values())
+        freq_word_ngrams = freq_word_ngrams_dict.values()
         word_repetition_ratio = sum(freq for freq in freq_word_ngrams if freq > 1) / sum(
             freq_word_ngrams
         )
@@ -888,6 +995,39 @@ class WordRepetitionRatioFilter(Filter):
         return word_repetition_ratio
 
 
+# digits are not regarded as special tokens
+# otherwise many false positives are made, i.e., good documents discarded
+_MAIN_SPECIAL_CHARACTERS = string.punctuation + string.whitespace  # + string.digits
+_OTHER_SPECIAL_CHARACTERS = (
+    "    　    ￼’“”–▬…✦�­£​•€«»°·═"
+    "×士＾˘⇓（）§″′´¿−±∈﻿¢ø‚„½¼¾¹²³―⁃，ˌ¸‹›ʺˈʻ¦‐⠀‰‑≤≥‖"
+    "◆●■►▼▲▴∆▻¡★☆✱ːº。¯˜¥ɪ≈†：⁄♡✓⊕․．⋅÷１‟；،、¨ाাी्े◦˚"
+    "゜ʼ≖ʼ¤℃√！？【】‿∞➤～πه۩☛₨➩☻๑٪♥ıॽ《‘©﴿٬？▷Г♫∟™ª₪®「—❖"
+    "」﴾》�"
+)
+# Built on the first use, since the emoji characters come from the optional `emoji` package.
+_DEFAULT_SPECIAL_CHARACTERS: Optional[FrozenSet[str]] = None
+# Lookup table of the default special characters indexed by code point.
+_IS_SPECIAL_CODE_POINT = np.zeros(0, dtype=np.bool_)
+# Shorter texts are counted by set lookups, which is faster than building an array of them.
+_SPECIAL_CODE_POINT_MIN_LEN = 64
+
+
+def _default_special_characters() -> FrozenSet[str]:
+    global _DEFAULT_SPECIAL_CHARACTERS, _IS_SPECIAL_CODE_POINT
+    if _DEFAULT_SPECIAL_CHARACTERS is None:
+        special_characters = frozenset(
+            set(_MAIN_SPECIAL_CHARACTERS + _OTHER_SPECIAL_CHARACTERS) | emoji.EMOJI_DATA.keys()
+        )
+        # Multi-character emoji sequences never match a single character,
+        # so only the single characters are registered.
+        is_special_code_point = np.zeros(sys.maxunicode + 1, dtype=np.bool_)
+        is_special_code_point[[ord(char) for char in special_characters if len(char) == 1]] = True
+        _IS_SPECIAL_CODE_POINT = is_special_code_point
+        _DEFAULT_SPECIAL_CHARACTERS = special_characters
+    return _DEFAULT_SPECIAL_CHARACTERS
+
+
 class DiscardTooManySpecialToken(Filter):
     """
     [!CAUTION] This filter requires `emoji` package. Please install it
@@ -907,32 +1047,28 @@ class DiscardTooManySpecialToken(Filter):
         """  # noqa: E501
         super().__init__(*args, **kwargs)
 
-        # digits are not regarded as special tokens
-        # otherwise many false positives are made, i.e., good documents discarded
-        main_special_characters = string.punctuation + string.whitespace  # + string.digits
-        other_special_characters = (
-            "    　    ￼’“”–▬…✦�­£​•€«»°·═"
-            "×士＾˘⇓（）§″′´¿−±∈﻿¢ø‚„½¼¾¹²³―⁃，ˌ¸‹›ʺˈʻ¦‐⠀‰‑≤≥‖"
-            "◆●■►▼▲▴∆▻¡★☆✱ːº。¯˜¥ɪ≈†：⁄♡✓⊕․．⋅÷１‟；،、¨ाাी्े◦˚"
-            "゜ʼ≖ʼ¤℃√！？【】‿∞➤～πه۩☛₨➩☻๑٪♥ıॽ《‘©﴿٬？▷Г♫∟™ª₪®「—❖"
-            "」﴾》�"
-        )
-
-        en_emoji = emoji.EMOJI_DATA.keys()
-
-        special_characters_default = set(main_special_characters + other_special_characters)
-        special_characters_default.update(en_emoji)
-        self.special_characters = special_characters_default
-
+        self.special_characters = set(_default_special_characters())
+        # The shared lookup table is used only while `special_characters` is
+        # the set created here and its size is unchanged, i.e., it is not modified.
+        self._default_special_characters = self.special_characters
+        self._default_special_characters_num = len(self.special_characters)
         self.threshold = threshold
 
     def _compute_special_characters_ratio(self, text: str) -> float:
         if len(text) == 0:
             return 0
 
-        special_characters_ratio = len(
-            [char for char in text if char in self.special_characters]
-        ) / len(text)
+        special_characters = self.special_characters
+        if (
+            len(text) < _SPECIAL_CODE_POINT_MIN_LEN
+            or special_characters is not self._default_special_characters
+            or len(special_characters) != self._default_special_characters_num
+        ):
+            special_characters_num = sum(map(special_characters.__contains__, text))
+        else:
+            code_points = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+            special_characters_num = int(np.count_nonzero(_IS_SPECIAL_CODE_POINT[code_points]))
+        special_characters_ratio = special_characters_num / len(text)
         return special_characters_ratio
 
     def apply(self, doc: Document) -> Document:
@@ -967,9 +1103,13 @@ class SingleCharacterRepetitionFilter(Filter):
         self.threshold = threshold
 
     def _is_repeat_contained(self, text: str) -> bool:
-        groups = groupby(text)
-        is_repeat_contained = any(sum(1 for _ in group) >= self.threshold for _, group in groups)
-        return is_repeat_contained
+        if len(text) < max(self.threshold, 1):
+            return False
+        # 文字をコードポイントの配列にし, 隣接する文字が変わる位置から連続の長さを求める
+        code_points = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        boundaries = np.flatnonzero(code_points[1:] != code_points[:-1])
+        run_lengths = np.diff(boundaries, prepend=-1, append=len(code_points) - 1)
+        return bool(run_lengths.max() >= self.threshold)
 
     def apply(self, doc: Document) -> Document:
         if self._is_repeat_contained(doc.text):
@@ -1007,10 +1147,10 @@ class DiscardTooManyEndingEllipsis(Filter):
         """  # noqa: E501
         super().__init__(*args, **kwargs)
         self.threshold = threshold
-        self.ellipsis_pattern = re.compile(r"(\.{3}|…)\n")  # matches ...\n and …\n
 
     def apply(self, doc: Document) -> Document:
-        ellipsis_count = len(self.ellipsis_pattern.findall(doc.text))
+        # counts ...\n and …\n. Both end with the newline, so their occurrences never overlap.
+        ellipsis_count = doc.text.count("...\n") + doc.text.count("…\n")
         newline_count = max(doc.text.count("\n"), 1)  # avoid zero division
         ellipsis_ratio = ellipsis_count / newline_count
 
@@ -1,10 +1,14 @@
 import hashlib
+import json
 import logging
+import mmap
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from os import PathLike
 from pathlib import Path
-from typing import Any, Tuple, Union
+from typing import Any, Dict, List, Sequence, Tuple, Union
 
 try:
     import requests
@@ -23,52 +27,168 @@ logger = logging.getLogger(__name__)
 
 FASTTEXT_MODEL_URL = "https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.bin"
 MODEL_CHECKSUM = "01810bc59c6a3d2b79c79e6336612f65"
+# Timeout in seconds for connecting to the server and for each read from it.
+REQUEST_TIMEOUT = 60
+
+_NEWLINE_TO_SPACE = str.maketrans({"\n": " "})
+_LABEL_PREFIX = "__label__"
 
 
 def _download_with_progress_bar(
-    download_url: str, save_path: Union[str, PathLike], retries: int = 3, delay: float = 1.0
+    download_url: str,
+    save_path: Union[str, PathLike],
+    retries: int = 3,
+    delay: float = 1.0,
+    chunk_size: int = 1 << 20,
 ) -> None:
+    """
+    Download a file through a single connection.
+
+    The file is written to `<save_path>.part` and renamed to `save_path` only when
+    the download completes, so a failed download never leaves a broken file at `save_path`.
+    On failure, the download is retried up to `retries` times, doubling `delay` each time.
+    """
     # HACK type hint `os.PathLike[str]` is not allowed in Python 3.8 or older.
     # So I write Union[str, PathLike]. In the future, I will use `os.PathLike[str]` or simply Path.
+    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+    part_path = Path(str(save_path) + ".part")
+    for attempt in range(retries + 1):
+        try:
+            with requests.get(download_url, stream=True, timeout=REQUEST_TIMEOUT) as r:
+                r.raise_for_status()
+                total_size = int(r.headers.get("content-length", 0))
+                with tqdm(total=total_size, unit="B", unit_scale=True) as pbar:
+                    with open(part_path, "wb") as f:
+                        for chunk in r.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            pbar.update(len(chunk))
+            os.replace(part_path, save_path)
+            return
+        except requests.RequestException as e:
+            if attempt < retries:
+                logger.warning(
+                    f"Download failed, retrying in {delay} seconds... "
+                    f"({retries - attempt} retries left)"
+                )
+                time.sleep(delay)
+                delay *= 2
+            else:
+                logger.error(f"Download failed after retries: {e}")
+                raise
+
+
+def _download_with_range_requests(
+    download_url: str,
+    save_path: Union[str, PathLike],
+    num_connections: int = 5,
+    chunk_size: int = 1 << 20,
+) -> None:
+    """
+    Download a file by splitting it into `num_connections` byte ranges
+    and fetching them concurrently with HTTP range requests.
+    Each range is written to its own region of the pre-allocated `<save_path>.part` file,
+    which is renamed to `save_path` when all the ranges are downloaded.
+
+    If the server does not accept range requests, the file is downloaded
+    through a single connection by `_download_with_progress_bar`.
+    """
+    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+    head = requests.head(download_url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+    head.raise_for_status()
+    total_size = int(head.headers.get("content-length", 0))
+    if head.headers.get("accept-ranges") != "bytes" or total_size == 0 or num_connections <= 1:
+        _download_with_progress_bar(download_url, save_path, chunk_size=chunk_size)
+        return
+
+    part_size = -(-total_size // num_connections)  # ceil division
+    byte_ranges = [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+    part_path = Path(str(save_path) + ".part")
     try:
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        with requests.get(download_url, stream=True) as r:
-            r.raise_for_status()
-            total_size = int(r.headers.get("content-length", 0))
-            with tqdm(total=total_size, unit="B", unit_scale=True) as pbar:
-                with open(save_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        pbar.update(len(chunk))
-    except requests.RequestException as e:
-        if retries > 0:
-            logger.warning(
-                f"Download failed, retrying in {delay} seconds... ({retries} retries left)"
-            )
-            time.sleep(delay)
-            _download_with_progress_bar(download_url, save_path, retries - 1, delay)
-        else:
-            logger.error(f"Download failed after retries: {e}")
-            raise
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)
+
+        with tqdm(total=total_size, unit="B", unit_scale=True) as pbar:
+
+            def download_range(byte_range: Tuple[int, int]) -> None:
+                start, end = byte_range
+                headers = {"Range": f"bytes={start}-{end}"}
+                with requests.get(
+                    download_url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT
+                ) as r:
+                    r.raise_for_status()
+                    if r.status_code != 206:
+                        raise requests.RequestException(
+                            f"Range request is not supported. Status code: {r.status_code}"
+                        )
+                    with open(part_path, "r+b") as f:
+                        f.seek(start)
+                        for chunk in r.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            pbar.update(len(chunk))
+
+            with ThreadPoolExecutor(max_workers=len(byte_ranges)) as executor:
+                # Consume the iterator to propagate exceptions raised in the threads.
+                list(executor.map(download_range, byte_ranges))
+    except BaseException:
+        # Do not leave the partially written file, which is as large as the complete one.
+        part_path.unlink(missing_ok=True)
+        raise
+    os.replace(part_path, save_path)
 
 
 def _get_md5_hash_of_file(file_path: Union[str, PathLike]) -> str:
     """
     Function to calculate the MD5 hash of a file.
 
-    Read the file in chunks to avoid loading large files into memory.
-    cf. https://stackoverflow.com/questions/3431825/generating-an-md5-checksum-of-a-file
+    The file is memory-mapped and passed to hashlib at once,
+    which avoids allocating a bytes object for each chunk of the large model file.
     """
     md5_hash = hashlib.md5()
     with open(file_path, "rb") as file:
-        while chunk := file.read(8192):
-            md5_hash.update(chunk)
+        # An empty file cannot be memory-mapped.
+        if os.fstat(file.fileno()).st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                md5_hash.update(mm)
     return md5_hash.hexdigest()
 
 
+def _get_model_checksum(model_path: Union[str, PathLike]) -> str:
+    """
+    Get the MD5 hash of the model file, caching it in a sibling `.stamp` file.
+
+    The stamp file records the modification time and the size of the model file
+    together with its hash. If they match the current file, the cached hash is returned
+    without re-reading the whole file.
+    """
+    stat = os.stat(model_path)
+    stamp_path = Path(str(model_path) + ".stamp")
+    try:
+        stamp = json.loads(stamp_path.read_text())
+        if stamp["mtime_ns"] == stat.st_mtime_ns and stamp["size"] == stat.st_size:
+            return str(stamp["md5"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    checksum = _get_md5_hash_of_file(model_path)
+    try:
+        stamp_path.write_text(
+            json.dumps({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "md5": checksum})
+        )
+    except OSError:
+        logger.warning(f"Failed to write the checksum stamp file: {stamp_path}")
+    return checksum
+
+
 def _download_fasttext_model(model_path: Union[str, PathLike]) -> None:
     logger.info(f"Downloading fasttext model from {FASTTEXT_MODEL_URL} to {model_path}...")
-    _download_with_progress_bar(FASTTEXT_MODEL_URL, model_path)
+    try:
+        _download_with_range_requests(FASTTEXT_MODEL_URL, model_path)
+    except requests.RequestException as e:
+        logger.warning(f"Parallel download failed: {e}. Retrying with a single connection...")
+        _download_with_progress_bar(FASTTEXT_MODEL_URL, model_path)
 
 
 class LanguageIdentificationByFastText(Filter):
@@ -86,6 +206,11 @@ class LanguageIdentificationByFastText(Filter):
         vep vi vls vo wa war wuu xal xmf yi yo yue zh
     """
 
+    # Loaded models are shared among the instances, keyed by the resolved model path
+    # and the modification time and the size of the file, so a replaced file is loaded again.
+    _MODEL_CACHE: Dict[Tuple[str, int, int], Any] = {}
+    _MODEL_CACHE_LOCK = threading.Lock()
+
     def __init__(
         self,
         language: str,
@@ -117,6 +242,8 @@ class LanguageIdentificationByFastText(Filter):
 
         self.lang_score_threshold = lang_score_threshold
         self.language = language
+        # Labels predicted by fastText are compared without stripping the prefix.
+        self._expected_label = _LABEL_PREFIX + language
 
         self.model_path = Path(model_path) if model_path else Path(os.getcwd()) / "lid.176.bin"
 
@@ -124,27 +251,51 @@ class LanguageIdentificationByFastText(Filter):
             logger.info("Fasttext model file was not found.")
             _download_fasttext_model(self.model_path)
 
-        assert _get_md5_hash_of_file(self.model_path) == MODEL_CHECKSUM, (
-            f"Checksum of the downloaded model file does not match the expected value. "
-            f"Expected: {MODEL_CHECKSUM}, "
-            f"Actual: {_get_md5_hash_of_file(self.model_path)}"
-        )
-        self.model = load_model(str(self.model_path))
+        self.model = self._load_model(self.model_path)
+
+    @classmethod
+    def _load_model(cls, model_path: Path) -> Any:
+        path = str(model_path.resolve())
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with cls._MODEL_CACHE_LOCK:
+            if key not in cls._MODEL_CACHE:
+                checksum = _get_model_checksum(model_path)
+                assert checksum == MODEL_CHECKSUM, (
+                    f"Checksum of the downloaded model file does not match the expected value. "
+                    f"Expected: {MODEL_CHECKSUM}, "
+                    f"Actual: {checksum}"
+                )
+                cls._MODEL_CACHE[key] = load_model(path)
+            return cls._MODEL_CACHE[key]
 
-    def _predict_language(self, text: str) -> Tuple[str, float]:
+    @staticmethod
+    def _preprocess_text(text: str) -> str:
         # fasttext cannot handle multiline input
         # so we must remove the newline character
-        text = text.strip().replace("\n", " ")
-        pred = self.model.predict(text)
-        pred_lang = pred[0][0].replace("__label__", "")
-        pred_score = pred[1][0]
-        return pred_lang, pred_score
+        text = text.strip()
+        if "\n" in text:
+            text = text.translate(_NEWLINE_TO_SPACE)
+        return text
 
     def apply(self, doc: Document) -> Document:
-        pred_lang, score = self._predict_language(doc.text)
-        if not (pred_lang == self.language and score >= self.lang_score_threshold):
-            doc.is_rejected = True
-        return doc
+        return self.apply_batch([doc])[0]
+
+    def apply_batch(self, batch: Sequence[Document]) -> List[Document]:
+        """
+        Predict the languages of the documents by a single call of the fastText model,
+        which accepts a list of texts.
+        """
+        docs = list(batch)
+        if len(docs) == 0:
+            return docs
+
+        texts = [self._preprocess_text(doc.text) for doc in docs]
+        labels, scores = self.model.predict(texts)
+        for doc, label, score in zip(docs, labels, scores):
+            if not (label[0] == self._expected_label and score[0] >= self.lang_score_threshold):
+                doc.is_rejected = True
+        return docs
 
 
 class AcceptJapaneseByFastText(LanguageIdentificationByFastText):
@@ -1,9 +1,12 @@
 import re
-from typing import Any
+import sys
+from typing import Any, List, Sequence
 
 from hojichar.core.filter_interface import TokenFilter
 from hojichar.core.models import Token
 
+_SEP = sys.intern("<sep>")
+
 
 class TokenAddDebagTag(TokenFilter):
     """トークン末尾にデバッグ用のタグを追加します."""
@@ -13,9 +16,21 @@ class TokenAddDebagTag(TokenFilter):
         >>> TokenAddDebagTag()("hello")
         'hello<sep>'
         """
-        token.text += "<sep>"
+        token.text = token.text + _SEP
         return token
 
+    def apply_batch(self, tokens: Sequence[Token]) -> List[Token]:
+        """
+        複数のトークンにまとめてタグを追加します.
+
+        >>> [t.text for t in TokenAddDebagTag().apply_batch([Token("a"), Token("b")])]
+        ['a<sep>', 'b<sep>']
+        """
+        sep = _SEP
+        for token in tokens:
+            token.text = token.text + sep
+        return list(tokens)
+
 
 class SEOTokenRemover(TokenFilter):
     """
@@ -24,15 +39,21 @@ class SEOTokenRemover(TokenFilter):
     the regex pattern is too complex.
     """
 
+    token_split_pat = re.compile(r"\ |-|・|,")
+    replace_pat = re.compile(
+        r"\-{5,},@[a-zA-Z0-9]+,[#\$\%\-]{4,},[＿=#\$\%\-]{4,}[\ ]*.+?[\ ]*[＿=#\$\%\-]{4,}|★[…━]+★"  # noqa
+    )
+
     def __init__(self, min_average_seo_char_length: int = 5, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.token_split_pat = re.compile(r"\ |-|・|,")
         self.min_average_seo_char_length = min_average_seo_char_length
-        self.replace_pat = re.compile(
-            r"\-{5,},@[a-zA-Z0-9]+,[#\$\%\-]{4,},[＿=#\$\%\-]{4,}[\ ]*.+?[\ ]*[＿=#\$\%\-]{4,}|★[…━]+★"  # noqa
-        )
 
     def apply(self, token: Token) -> Token:
+        # Every match of `replace_pat` starts with "-" or "★".
+        # Skip the split and the regex search for the tokens without them.
+        if "-" not in token.text and "★" not in token.text:
+            return token
+
         seo_words = self.token_split_pat.split(token.text.strip())
         n_words = len(seo_words)
         if n_words == 0:
@@ -63,13 +63,13 @@ class SentenceTokenizer(Filter):
         >>> SentenceTokenizer().tokenize("さよなら。また来週")
         ['さよなら。', 'また来週']
         """
-        tokens = text.split("。")
-        if len(tokens) > 1:
-            if text.endswith("。"):
-                tokens = [token + "。" for token in tokens[:-1]]
-            else:
-                last = tokens[-1]
-                tokens = [token + "。" for token in tokens]
-                tokens[-1] = last
-
+        # 句点で分割して句点を戻します. 末尾の句点で終わらない文はそのまま残します.
+        sentences = text.split("。")
+        last = sentences.pop()
+        tokens = [sentence + "。" for sentence in sentences]
+        if last:
+            tokens.append(last)
+        if len(tokens) == 0:
+            # Empty text
+            return [text]
         return tokens
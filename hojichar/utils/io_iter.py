@@ -1,6 +1,14 @@
 import io
 import sys
-from typing import Iterator, TextIO
+import time
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+# Output lines are joined into chunks of about this many characters before being written.
+WRITE_BUFFER_SIZE = 1 << 20
+# Smaller chunks for a piped standard output, whose reader may consume the lines as they come.
+PIPE_BUFFER_SIZE = 1 << 16
+# Lines held for a piped standard output are passed to the reader after at most this many seconds.
+PIPE_FLUSH_INTERVAL = 0.1
 
 
 def stdin_iter() -> Iterator[str]:
@@ -22,7 +30,38 @@ def stdin_iter() -> Iterator[str]:
     return (line.rstrip("\n") for line in stdin)
 
 
-def stdout_from_iter(iter: Iterator[str]) -> None:
+def _join_lines(
+    iter: Iterable[str],
+    buffer_size: int = WRITE_BUFFER_SIZE,
+    flush_interval: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    Join lines into newline-terminated chunks of about `buffer_size` characters,
+    so that the output is written by a few large writes instead of one write per line.
+    If `flush_interval` is given, a chunk is also yielded when that many seconds have passed
+    since its first line, which is checked when the next line arrives.
+    """
+    chunk: List[str] = []
+    chunk_len = 0
+    chunk_started = 0.0
+    for line in iter:
+        if not chunk and flush_interval is not None:
+            chunk_started = time.monotonic()
+        chunk.append(line)
+        chunk_len += len(line) + 1
+        if chunk_len >= buffer_size or (
+            flush_interval is not None and time.monotonic() - chunk_started >= flush_interval
+        ):
+            chunk.append("")
+            yield "\n".join(chunk)
+            chunk = []
+            chunk_len = 0
+    if chunk:
+        chunk.append("")
+        yield "\n".join(chunk)
+
+
+def stdout_from_iter(iter: Iterable[str]) -> None:
     """
     Write iterators to standard output.
 
@@ -38,19 +77,33 @@ def stdout_from_iter(iter: Iterator[str]) -> None:
         - Piped commands sometimes interrupt in the middle of output,
         as is the case with head, less, etc.
         These raise a BrokenPipeError exception and must be handled properly.
+
+    Line buffering is applied when the standard output is a terminal.
+    Otherwise, e.g. piped or redirected to a file, lines are encoded in utf-8 in chunks and
+    written to the binary buffer of the standard output, which is flushed after each chunk,
+    since the per-line write of `io.TextIOWrapper` dominates the cost of large outputs.
+    A chunk is written when it reaches `PIPE_BUFFER_SIZE` characters, or when
+    `PIPE_FLUSH_INTERVAL` seconds have passed since its first line, so that a reader
+    such as `head -n 1` receives the lines without waiting for a large buffer to fill.
     """
-    stdout = io.TextIOWrapper(
-        buffer=sys.stdout.buffer,
-        encoding="utf-8",
-        line_buffering=True,
-    )
     try:
-        for line in iter:
-            stdout.write(line + "\n")
+        if sys.stdout.isatty():
+            stdout = io.TextIOWrapper(
+                buffer=sys.stdout.buffer,
+                encoding="utf-8",
+                line_buffering=True,
+            )
+            for line in iter:
+                stdout.write(line + "\n")
+        else:
+            sys.stdout.flush()
+            for chunk in _join_lines(iter, PIPE_BUFFER_SIZE, PIPE_FLUSH_INTERVAL):
+                sys.stdout.buffer.write(chunk.encode("utf-8"))
+                sys.stdout.buffer.flush()
     except BrokenPipeError:
         sys.exit(1)
 
 
-def fileout_from_iter(fp: TextIO, iter: Iterator[str]) -> None:
-    for line in iter:
-        fp.write(line + "\n")
+def fileout_from_iter(fp: TextIO, iter: Iterable[str]) -> None:
+    for chunk in _join_lines(iter):
+        fp.write(chunk)
@@ -1,3 +1,4 @@
+import importlib.machinery
 import importlib.util
 import logging
 import sys
@@ -16,7 +17,10 @@ def _load_module(path: Union[str, PathLike]) -> ModuleType:
     # So I write Union[str, PathLike]
     path_obj = Path(path)
     module_name = path_obj.stem
-    spec = importlib.util.spec_from_file_location(module_name, path_obj)
+    # Unlike `spec_from_file_location`, the loader is given explicitly,
+    # so a file without the `.py` suffix is also loaded as Python source.
+    loader = importlib.machinery.SourceFileLoader(module_name, str(path_obj))
+    spec = importlib.util.spec_from_loader(module_name, loader)
     if spec and spec.loader:
         module = importlib.util.module_from_spec(spec)
         sys.modules[module_name] = module
@@ -24,6 +28,15 @@ def _load_module(path: Union[str, PathLike]) -> ModuleType:
     return module
 
 
+def _load_profile(profile_path: Union[str, PathLike]) -> ModuleType:
+    """
+    Execute a profile as a new module, after adding its directory to sys.path.
+    Each call returns a new module, so the filters defined in the profile are not shared.
+    """
+    sys.path.append(str(Path(profile_path).parent))
+    return _load_module(profile_path)
+
+
 def load_filter_from_file(profile_path: Union[str, PathLike]) -> hojichar.Compose:
     """
     Loading a profile which has `FILTER` variable.
@@ -39,8 +52,10 @@ def load_filter_from_file(profile_path: Union[str, PathLike]) -> hojichar.Compos
     Returns:
         hojichar.Compose:
     """
-    sys.path.append(str(Path(profile_path).parent))
-    module = _load_module(profile_path)
+    return _get_filter(_load_profile(profile_path))
+
+
+def _get_filter(module: ModuleType) -> hojichar.Compose:
     if hasattr(module, "FILTER"):
         filter = getattr(module, "FILTER")
         if not isinstance(filter, hojichar.Compose):
@@ -67,8 +82,10 @@ def load_factory_from_file(
         Callable[[Optional[Any]], hojichar.Compose]:
             An alias of the function which returns Compose.
     """
-    sys.path.append(str(Path(profile_path).parent))
-    module = _load_module(profile_path)
+    return _get_factory(_load_profile(profile_path))
+
+
+def _get_factory(module: ModuleType) -> Callable[[Optional[Any]], hojichar.Compose]:
     if hasattr(module, "FACTORY"):
         factory: Callable[[Optional[Any]], hojichar.Compose] = getattr(module, "FACTORY")
         return factory
@@ -95,14 +112,16 @@ def load_compose(profile_path: Union[str, PathLike], *factroy_args: str) -> hoji
     Returns:
         hojichar.Compose:
     """
+    # The profile is executed only once, and a new Compose is built on each call.
+    module = _load_profile(profile_path)
     try:
-        filter = load_filter_from_file(profile_path)
+        filter = _get_filter(module)
         _check_args_num_mismatch(len(factroy_args))
         return filter
     except NotImplementedError:
-        return load_parametrized_filter_from_file(profile_path, *factroy_args)
+        return _get_factory(module)(*factroy_args)
 
 
 def _check_args_num_mismatch(num_args: int) -> None:
     if num_args > 0:
-        logger.warning(f"Warning: {num_args} arguments are ignored.")
+        logger.warning("Warning: %d arguments are ignored.", num_args)
@@ -1,11 +1,29 @@
 import numpy as np
 
 from hojichar.core.composition import Compose
+from hojichar.core.filter_interface import Filter
 from hojichar.core.models import Document
-from hojichar.filters.document_filters import DiscardAll, ExampleHojiChar, Identity
+from hojichar.filters.document_filters import (
+    DiscardAll,
+    ExampleDiscardDocumentContainKeyword,
+    ExampleHojiChar,
+    Identity,
+)
 from hojichar.filters.tokenization import BlankCharTokenizer
 
 
+class BatchSize(Filter):
+    """Appends the size of the batch which the document is processed in."""
+
+    def apply(self, document):
+        return self.apply_batch([document])[0]
+
+    def apply_batch(self, batch):
+        for document in batch:
+            document.text += f"<{len(batch)}>"
+        return list(batch)
+
+
 class TestCompose:
     def test_compose(self):
         cleaner = Compose([ExampleHojiChar(), ExampleHojiChar()])
@@ -28,6 +46,78 @@ class TestCompose:
         assert counts["1-DiscardAll"].diff_bytes == -1
         assert counts["2-ExampleHojiChar"].diff_bytes == 0
 
+    def test_reject_reason(self):
+        cleaner = Compose([Identity(), DiscardAll()])
+        assert cleaner.apply(Document("hoge")).reject_reason == {"name": "DiscardAll", "p": 1}
+        assert Compose([Identity()]).apply(Document("hoge")).reject_reason is None
+
+    def test_total_bytes(self):
+        cleaner = Compose([Identity(), ExampleHojiChar(), Identity()])
+        cleaner("ほうじ茶")
+        total_info = cleaner.statistics_obj.total_info
+        assert total_info.input_bytes == len("ほうじ茶".encode("utf-8"))
+        assert total_info.output_bytes == len("ほうじ茶<hojichar>".encode("utf-8"))
+        assert cleaner.statistics_obj.layers_info["1-ExampleHojiChar"].diff_bytes == 10
+
+    def test_skip_tail_after_rejection(self):
+        cleaner = Compose([DiscardAll(), ExampleHojiChar(), ExampleHojiChar()])
+        doc = cleaner.apply(Document("hoge"))
+        assert doc.is_rejected
+        assert doc.text == "hoge"
+        stats = cleaner.statistics_obj
+        assert stats.total_info.discard_num == 1
+        assert stats.layers_info["0-DiscardAll"].discard_num == 1
+        assert stats.layers_info["1-ExampleHojiChar"].diff_bytes == 0
+
+        # The layers after the rejection record nothing, not even the elapsed time.
+        for apply in ["apply", "apply_batch"]:
+            cleaner = Compose([ExampleHojiChar(), DiscardAll(p=0.5), ExampleHojiChar()], 0)
+            if apply == "apply":
+                docs = [cleaner.apply(Document("hoge")) for _ in range(20)]
+            else:
+                docs = cleaner.apply_batch([Document("hoge") for _ in range(20)])
+            discard_num = sum(doc.is_rejected for doc in docs)
+            assert 0 < discard_num < 20
+            layers = cleaner.statistics_obj.layers_info
+            assert layers["0-ExampleHojiChar"].diff_bytes == 20 * 10
+            assert layers["1-DiscardAll"].discard_num == discard_num
+            assert layers["1-DiscardAll"].diff_bytes == -discard_num * len("hoge<hojichar>")
+            assert layers["2-ExampleHojiChar"].discard_num == 0
+            assert layers["2-ExampleHojiChar"].diff_bytes == (20 - discard_num) * 10
+            assert cleaner.statistics_obj.total_info.discard_num == discard_num
+
+        cleaner = Compose([DiscardAll(), ExampleHojiChar()])
+        cleaner.apply(Document("hoge"))
+        cleaner.apply_batch([Document("hoge")])
+        assert cleaner.statistics_obj.layers_info["1-ExampleHojiChar"].cumulative_time_ns == 0
+        assert cleaner.statistics_obj.total_info.processed_num == 2
+
+        cleaner = Compose([DiscardAll(), ExampleHojiChar(skip_rejected=False), Identity()])
+        assert cleaner.apply(Document("hoge")).text == "hoge<hojichar>"
+
+    def test_disable_statistics(self):
+        def make_cleaner():
+            return Compose(
+                [
+                    ExampleHojiChar(p=0.5),
+                    DiscardAll(p=0.5),
+                    ExampleHojiChar(skip_rejected=False),
+                    ExampleHojiChar(),
+                ],
+                random_state=0,
+            )
+
+        cleaner = make_cleaner()
+        fast_cleaner = make_cleaner()
+        fast_cleaner.disable_statistics()
+        for i in range(20):
+            doc = cleaner.apply(Document(str(i)))
+            fast_doc = fast_cleaner.apply(Document(str(i)))
+            assert (fast_doc.text, fast_doc.is_rejected) == (doc.text, doc.is_rejected)
+            assert fast_doc.reject_reason == doc.reject_reason
+        assert cleaner.statistics_obj.total_info.processed_num == 20
+        assert fast_cleaner.statistics_obj.total_info.processed_num == 0
+
     def test_random_apply1(self):
         cleaner = Compose([DiscardAll(p=0.1)], random_state=42)
         count_discard = 0
@@ -45,6 +135,62 @@ class TestCompose:
                 count_discard += 1
         assert count_discard < 1500
 
+    def test_random_apply_batch(self):
+        cleaner = Compose([DiscardAll(p=0.1), ExampleHojiChar()], random_state=42)
+        docs = cleaner.apply_batch([Document("hoge") for _ in range(10000)])
+        count_discard = sum(doc.is_rejected for doc in docs)
+        assert 500 < count_discard < 1500
+        assert all(doc.text == "hoge<hojichar>" for doc in docs if not doc.is_rejected)
+        assert cleaner.statistics["total_info"]["discard_num"] == count_discard
+
+    def test_apply_batch_dispatches_to_filters(self):
+        cleaner = Compose([DiscardAll(p=0.5), BatchSize(), ExampleHojiChar()], random_state=0)
+        docs = cleaner.apply_batch([Document(str(i)) for i in range(100)])
+        kept = [doc for doc in docs if not doc.is_rejected]
+        assert all(doc.text.endswith(f"<{len(kept)}><hojichar>") for doc in kept)
+
+    def test_apply_batch_draws_only_for_random_filters(self):
+        cleaner = Compose([ExampleHojiChar(), DiscardAll(p=0.5)], random_state=0)
+        docs = cleaner.apply_batch([Document(str(i)) for i in range(100)])
+        expected = np.random.default_rng(0).random(100) < 0.5
+        assert [doc.is_rejected for doc in docs] == expected.tolist()
+
+    def test_apply_batch_same_as_apply(self):
+        def make_cleaner():
+            return Compose(
+                [
+                    Identity(),
+                    ExampleDiscardDocumentContainKeyword("3"),
+                    ExampleHojiChar(skip_rejected=False),
+                    BlankCharTokenizer(),
+                    ExampleHojiChar(),
+                ]
+            )
+
+        def state(doc):
+            return doc.text, doc.is_rejected, doc.reject_reason, doc.get_tokens()
+
+        def counts(cleaner):
+            stats = cleaner.statistics
+            for layer in [stats["total_info"], *stats["layers_info"]]:
+                del layer["cumulative_time"]
+            return stats
+
+        texts = [f"ほうじ 茶 {i}" for i in range(20)]
+        cleaner = make_cleaner()
+        docs = [cleaner.apply(Document(text)) for text in texts]
+        batch_cleaner = make_cleaner()
+        batch_docs = batch_cleaner.apply_batch([Document(text) for text in texts])
+        assert [state(doc) for doc in batch_docs] == [state(doc) for doc in docs]
+        assert counts(batch_cleaner) == counts(cleaner)
+        assert counts(cleaner)["total_info"]["discard_num"] == 2
+
+    def test_apply_batch_tuple(self):
+        cleaner = Compose([ExampleHojiChar()])
+        docs = cleaner.apply_batch((Document("hoge"), Document("fuga")))
+        assert isinstance(docs, list)
+        assert [doc.text for doc in docs] == ["hoge<hojichar>", "fuga<hojichar>"]
+
     def test_token_count(self):
         cleaner = Compose([BlankCharTokenizer()])
         cleaner("foo bar")
@@ -1,4 +1,6 @@
-from hojichar.core.models import Document
+import pickle
+
+from hojichar.core.models import Document, Token
 
 
 def test_repr() -> None:
@@ -6,3 +8,61 @@ def test_repr() -> None:
     assert repr(doc) == "Document(text='test', is_rejected=False, extras={'test': 'test'})"
     assert eval(repr(doc)).text == doc.text
     assert eval(repr(doc)).extras == doc.extras
+
+
+def test_document_pickle() -> None:
+    doc = Document("test", extras={"test": "test"})
+    doc.text = "processed"
+    doc.is_rejected = True
+    loaded = pickle.loads(pickle.dumps(doc))
+    assert loaded.text == "processed"
+    assert loaded.original == "test"
+    assert loaded.is_rejected
+    assert loaded.extras == {"test": "test"}
+
+
+def test_document_attributes() -> None:
+    doc = Document("test")
+    # Filters may store their own data on a document.
+    setattr(doc, "score", 0.5)
+    assert vars(doc)["score"] == 0.5
+    assert vars(doc)["text"] == "test"
+
+
+def test_token_pickle() -> None:
+    token = Token("test")
+    token.text = "processed"
+    loaded = pickle.loads(pickle.dumps(token))
+    assert loaded.text == "processed"
+    assert loaded.original == "test"
+    assert not loaded.is_rejected
+
+
+class SlottedDocument(Document):
+    __slots__ = ("source", "__score")
+
+    def __init__(self, text: str, source: str, score: float) -> None:
+        super().__init__(text)
+        self.source = source
+        self.__score = score
+
+    @property
+    def score(self) -> float:
+        return self.__score
+
+
+class SubclassedDocument(SlottedDocument):
+    pass
+
+
+def test_document_subclass_pickle() -> None:
+    doc = SubclassedDocument("test", source="web", score=0.5)
+    doc.text = "processed"
+    setattr(doc, "note", "note")
+    loaded = pickle.loads(pickle.dumps(doc))
+    assert type(loaded) is SubclassedDocument
+    assert loaded.text == "processed"
+    assert loaded.original == "test"
+    assert loaded.source == "web"
+    assert loaded.score == 0.5
+    assert vars(loaded)["note"] == "note"
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+from typing import Sequence
 
 import pytest
 
 import hojichar
 from hojichar.core.parallel import Parallel
-from hojichar.filters.document_filters import JSONDumper, JSONLoader
+from hojichar.filters.document_filters import ExampleHojiChar, JSONDumper, JSONLoader
 
 
 class RaiseKeywords(hojichar.Filter):
@@ -17,26 +19,97 @@ class RaiseKeywords(hojichar.Filter):
         return document
 
 
+class BatchSize(hojichar.Filter):
+    def apply(self, document: hojichar.Document) -> hojichar.Document:
+        return self.apply_batch([document])[0]
+
+    def apply_batch(self, batch: Sequence[hojichar.Document]) -> list[hojichar.Document]:
+        for document in batch:
+            document.text = f"{len(batch)}"
+        return list(batch)
+
+
+class Seen(hojichar.Filter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.seen: set[str] = set()
+
+    def apply(self, document: hojichar.Document) -> hojichar.Document:
+        if document.text in self.seen:
+            document.is_rejected = True
+        self.seen.add(document.text)
+        return document
+
+
+class UpperCase(hojichar.Filter):
+    def __init__(self) -> None:
+        super().__init__()
+        # A lambda cannot be pickled, so the filter reaches the workers only by fork.
+        self.transform = lambda text: text.upper()
+
+    def apply(self, document: hojichar.Document) -> hojichar.Document:
+        document.text = self.transform(document.text)
+        return document
+
+
 @pytest.mark.parametrize("num_jobs", [1, 4, None])
-def test_processed_docs_count(num_jobs: int | None) -> None:
+@pytest.mark.parametrize("chunksize", [1, 3, 64])
+def test_processed_docs_count(num_jobs: int | None, chunksize: int) -> None:
     documents = [hojichar.Document(json.dumps({"text": f"doc_{i}"})) for i in range(10)]
     filter = hojichar.Compose([JSONLoader(), JSONDumper()])
 
-    with Parallel(filter, num_jobs=num_jobs) as pfilter:
+    with Parallel(filter, num_jobs=num_jobs, chunksize=chunksize) as pfilter:
         list(pfilter.imap_apply(iter(documents)))
         assert pfilter.statistics_obj.total_info.processed_num == 10
 
 
 @pytest.mark.parametrize("num_jobs", [1, 4, None])
-def test_processed_docs_equality(num_jobs: int | None) -> None:
+@pytest.mark.parametrize("chunksize", [1, 3, 64])
+def test_processed_docs_equality(num_jobs: int | None, chunksize: int) -> None:
     documents = [hojichar.Document(json.dumps({"text": f"doc_{i}"})) for i in range(10)]
     filter = hojichar.Compose([JSONLoader(), JSONDumper()])
 
-    with Parallel(filter, num_jobs=num_jobs) as pfilter:
+    with Parallel(filter, num_jobs=num_jobs, chunksize=chunksize) as pfilter:
         processed_docs = list(pfilter.imap_apply(iter(documents)))
         assert set(str(s) for s in processed_docs) == set(str(s) for s in documents)
 
 
+@pytest.mark.parametrize("num_jobs", [1, 4, None])
+@pytest.mark.parametrize("chunksize", [1, 3, 64])
+def test_processed_docs_order(num_jobs: int | None, chunksize: int) -> None:
+    documents = [hojichar.Document(json.dumps({"text": f"doc_{i}"})) for i in range(100)]
+    filter = hojichar.Compose([JSONLoader(), JSONDumper()])
+
+    with Parallel(filter, num_jobs=num_jobs, chunksize=chunksize, ordered=True) as pfilter:
+        processed_docs = list(pfilter.imap_apply(iter(documents)))
+        assert [str(s) for s in processed_docs] == [str(s) for s in documents]
+        assert pfilter.statistics_obj.total_info.processed_num == 100
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available on this platform.",
+)
+def test_filter_is_inherited_by_workers() -> None:
+    documents = [hojichar.Document(f"doc_{i}") for i in range(10)]
+    filter = hojichar.Compose([UpperCase()])
+
+    with Parallel(filter, num_jobs=2, ordered=True, start_method="fork") as pfilter:
+        processed_docs = list(pfilter.imap_apply(iter(documents)))
+    assert [str(s) for s in processed_docs] == [f"DOC_{i}" for i in range(10)]
+
+
+def test_disable_statistics() -> None:
+    documents = [hojichar.Document(json.dumps({"text": f"doc_{i}"})) for i in range(10)]
+    filter = hojichar.Compose([JSONLoader(), JSONDumper()])
+    filter.disable_statistics()
+
+    with Parallel(filter, num_jobs=2) as pfilter:
+        processed_docs = list(pfilter.imap_apply(iter(documents)))
+        assert set(str(s) for s in processed_docs) == set(str(s) for s in documents)
+    assert filter.statistics_obj.total_info.processed_num == 0
+
+
 @pytest.mark.parametrize("num_jobs", [1, 4, None])
 def test_filter_statistics_increment(num_jobs: int | None) -> None:
     documents = [hojichar.Document(json.dumps({"text": f"doc_{i}"})) for i in range(10)]
@@ -67,3 +140,23 @@ def test_parallel_with_error_handling(num_jobs: int | None) -> None:
         assert list(str(s) for s in processed_docs) == [""] * 10
         pfilter.statistics_obj.total_info.processed_num == 0
     assert error_filter.statistics_obj.total_info.processed_num == 0
+
+
+def test_chunk_is_processed_as_batch() -> None:
+    documents = [hojichar.Document(f"doc_{i}") for i in range(10)]
+    filter = hojichar.Compose([BatchSize()])
+
+    with Parallel(filter, num_jobs=1, chunksize=4, ordered=True) as pfilter:
+        processed_docs = list(pfilter.imap_apply(iter(documents)))
+    assert [str(s) for s in processed_docs] == ["4"] * 8 + ["2"] * 2
+
+
+def test_errors_are_isolated_from_stateful_filters() -> None:
+    documents = [hojichar.Document(f"doc_{i}") for i in range(5)] + [hojichar.Document("<raise>")]
+    filter = hojichar.Compose([Seen(), ExampleHojiChar(), RaiseKeywords()])
+
+    with Parallel(filter, num_jobs=1, ignore_errors=True, ordered=True) as pfilter:
+        processed_docs = list(pfilter.imap_apply(iter(documents)))
+    assert [str(s) for s in processed_docs] == [f"doc_{i}<hojichar>" for i in range(5)] + [""]
+    assert [s.is_rejected for s in processed_docs] == [False] * 5 + [True]
+    assert filter.statistics_obj.total_info.processed_num == 5
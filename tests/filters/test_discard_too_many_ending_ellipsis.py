@@ -10,6 +10,8 @@ from hojichar.filters.document_filters import DiscardTooManyEndingEllipsis
         ("これはまともな文書です\n", False),
         ("今日は...\nあなたの運勢...\n占いましょう…\n", True),
         ("", False),
+        ("....\n.…\n", True),
+        ("..\n…\nこれはまともな文書です\n", False),
     ],
 )
 def test_discard_too_many_ending_ellipsis(input_str: str, is_rejected: bool) -> None:
@@ -18,3 +18,44 @@ from hojichar.filters.document_filters import DiscardTooManySpecialToken
 def test_discard_too_many_special_tokens(input_str: str, is_rejected: bool) -> None:
     filter = DiscardTooManySpecialToken()
     assert filter.apply(Document(input_str)).is_rejected == is_rejected
+
+
+@pytest.mark.parametrize(
+    "input_str",
+    [
+        "",
+        "ほうじ茶",
+        "!!!???   ",
+        "家族👨‍👩‍👧で🍵",
+        "\ud800…\U0010ffff",
+        "a\tb\nc。、",
+        "ほうじ茶！🍵\n" * 20,
+        "\ud800…\U0010ffff" * 30,
+    ],
+)
+def test_special_characters_ratio(input_str: str) -> None:
+    filter = DiscardTooManySpecialToken()
+    expected = (
+        sum(char in filter.special_characters for char in input_str) / len(input_str)
+        if input_str
+        else 0
+    )
+    assert filter._compute_special_characters_ratio(input_str) == expected
+
+
+@pytest.mark.parametrize("input_str", ["ほうじ茶", "ほうじ茶" * 20])
+def test_custom_special_characters(input_str: str) -> None:
+    filter = DiscardTooManySpecialToken()
+    filter.special_characters = {"茶"}
+    assert filter._compute_special_characters_ratio(input_str) == 0.25
+    assert DiscardTooManySpecialToken()._compute_special_characters_ratio(input_str) == 0
+
+
+@pytest.mark.parametrize("input_str", ["ほうじ茶", "ほうじ茶" * 20])
+def test_modified_special_characters(input_str: str) -> None:
+    filter = DiscardTooManySpecialToken()
+    filter.special_characters.add("茶")
+    assert filter._compute_special_characters_ratio(input_str) == 0.25
+    filter.special_characters.update("ほう")
+    assert filter._compute_special_characters_ratio(input_str) == 0.75
+    assert DiscardTooManySpecialToken()._compute_special_characters_ratio(input_str) == 0
@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from hojichar.core.models import Document
 from hojichar.filters import document_filters, tokenization
 
@@ -24,6 +28,10 @@ class TestSentenceTokenizer:
             "さよなら",
         ] == transfomed_doc.get_tokens()
 
+        assert tokenizer.tokenize("") == [""]
+        assert tokenizer.tokenize("。。") == ["。", "。"]
+        assert tokenizer.tokenize("\n。改行\n") == ["\n。", "改行\n"]
+
 
 class TestJSONLoader:
     def test_apply(self):
@@ -40,3 +48,29 @@ class TestJSONLoader:
         assert loaded.text == "おはよう。おやすみ。ありがとう。さよなら。"
         assert loaded.extras["url"] == "https://example.com"
         assert loaded.extras["title"] == "example"
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_apply_same_as_json(self, monkeypatch, use_orjson):
+        monkeypatch.setattr(
+            document_filters, "is_loaded_orjson", use_orjson and document_filters.is_loaded_orjson
+        )
+        data = '{"text": "ほうじ茶\\ud800", "nan": NaN, "big": 18446744073709551616}'
+        loaded = document_filters.JSONLoader(extra_keys=["nan", "big"]).apply(Document(data))
+        assert loaded.text == json.loads(data)["text"]
+        assert loaded.extras["big"] == 18446744073709551616
+
+        with pytest.raises(json.JSONDecodeError, match="Expecting value"):
+            document_filters.JSONLoader().apply(Document('{"text": hello'))
+
+
+class TestJSONDumper:
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @pytest.mark.parametrize(
+        "text", ["hojichar", "ほうじ茶", 'quote " and \\ backslash', "\n\t\x00\x1f\x7f", "\ud800"]
+    )
+    def test_apply_same_as_json(self, monkeypatch, use_orjson, text):
+        monkeypatch.setattr(
+            document_filters, "is_loaded_orjson", use_orjson and document_filters.is_loaded_orjson
+        )
+        dumped = document_filters.JSONDumper().apply(Document(text))
+        assert dumped.text == json.dumps({"text": text}, ensure_ascii=False)
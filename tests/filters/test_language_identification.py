@@ -1,7 +1,24 @@
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 import pytest
+import requests
 
 from hojichar.core.models import Document
-from hojichar.filters.language_identification import AcceptJapaneseByFastText
+from hojichar.filters import language_identification
+from hojichar.filters.language_identification import (
+    MODEL_CHECKSUM,
+    REQUEST_TIMEOUT,
+    AcceptJapaneseByFastText,
+    LanguageIdentificationByFastText,
+    _download_fasttext_model,
+    _download_with_progress_bar,
+    _download_with_range_requests,
+    _get_md5_hash_of_file,
+    _get_model_checksum,
+)
 
 
 @pytest.mark.download_test
@@ -17,3 +34,214 @@ def test_accept_japanese_by_fasttext() -> None:
     assert filter.apply(Document("I am an NLPer")).is_rejected
     assert filter.apply(Document("快三手机投注平台代理")).is_rejected
     assert filter.apply(Document("Carrément dernier vin meilleur mais boulangerie.")).is_rejected
+
+
+@pytest.mark.download_test
+def test_accept_japanese_by_fasttext_batch() -> None:
+    filter = AcceptJapaneseByFastText()
+
+    texts = ["ほうじ茶", "I am an NLPer", "自然言語処理\nさいこう！", "快三手机投注平台代理"]
+    batch = filter.apply_batch([Document(text) for text in texts])
+    assert [doc.is_rejected for doc in batch] == [False, True, False, True]
+    assert [doc.is_rejected for doc in batch] == [
+        filter.apply(Document(text)).is_rejected for text in texts
+    ]
+
+
+@pytest.mark.download_test
+def test_fasttext_model_is_shared() -> None:
+    assert AcceptJapaneseByFastText().model is AcceptJapaneseByFastText().model
+
+
+@pytest.mark.parametrize("content", [b"", b"hojichar", bytes(range(256)) * 10000])
+def test_get_md5_hash_of_file(tmp_path: Path, content: bytes) -> None:
+    file_path = tmp_path / "model.bin"
+    file_path.write_bytes(content)
+    assert _get_md5_hash_of_file(file_path) == hashlib.md5(content).hexdigest()
+
+
+def test_model_checksum_stamp(tmp_path: Path) -> None:
+    model_path = tmp_path / "model.bin"
+    model_path.write_bytes(b"hojichar")
+    expected = hashlib.md5(b"hojichar").hexdigest()
+
+    assert _get_model_checksum(model_path) == expected
+    assert (tmp_path / "model.bin.stamp").exists()
+    assert _get_model_checksum(model_path) == expected
+
+    model_path.write_bytes(b"hojicha")
+    assert _get_model_checksum(model_path) == hashlib.md5(b"hojicha").hexdigest()
+
+
+def test_model_checksum_stamp_is_best_effort(tmp_path: Path, monkeypatch) -> None:
+    def fail_to_write(self, *args, **kwargs):
+        raise PermissionError("Read-only file system")
+
+    model_path = tmp_path / "model.bin"
+    model_path.write_bytes(b"hojichar")
+    monkeypatch.setattr(Path, "write_text", fail_to_write)
+    assert _get_model_checksum(model_path) == hashlib.md5(b"hojichar").hexdigest()
+    assert not (tmp_path / "model.bin.stamp").exists()
+
+
+def test_model_cache_is_keyed_on_file(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(LanguageIdentificationByFastText, "_MODEL_CACHE", {})
+    monkeypatch.setattr(language_identification, "_get_model_checksum", lambda _: MODEL_CHECKSUM)
+    monkeypatch.setattr(language_identification, "load_model", lambda path: object())
+
+    model_path = tmp_path / "model.bin"
+    model_path.write_bytes(b"hojichar")
+    model = LanguageIdentificationByFastText._load_model(model_path)
+    assert LanguageIdentificationByFastText._load_model(model_path) is model
+
+    # A model file replaced in place is loaded again.
+    model_path.write_bytes(b"hojichar2")
+    assert LanguageIdentificationByFastText._load_model(model_path) is not model
+
+
+class MockResponse:
+    def __init__(self, content: bytes, fail: bool = False, status_code: int = 200) -> None:
+        self.content = content
+        self.fail = fail
+        self.status_code = status_code
+        self.headers = {"content-length": str(len(content))}
+
+    def __enter__(self) -> "MockResponse":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int):
+        yield self.content[:1]
+        if self.fail:
+            raise requests.ConnectionError("Connection broken")
+        yield self.content[1:]
+
+
+def test_download_with_progress_bar_retry(tmp_path: Path, monkeypatch) -> None:
+    responses = [MockResponse(b"hojichar", fail=True), MockResponse(b"hojichar")]
+    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: responses.pop(0))
+    monkeypatch.setattr(language_identification.time, "sleep", lambda _: None)
+
+    save_path = tmp_path / "model.bin"
+    _download_with_progress_bar("https://example.com/model.bin", save_path)
+    assert save_path.read_bytes() == b"hojichar"
+    assert not (tmp_path / "model.bin.part").exists()
+
+
+def test_download_with_progress_bar_failure(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(
+        requests, "get", lambda *args, **kwargs: MockResponse(b"hojichar", fail=True)
+    )
+    monkeypatch.setattr(language_identification.time, "sleep", lambda _: None)
+
+    save_path = tmp_path / "model.bin"
+    with pytest.raises(requests.ConnectionError):
+        _download_with_progress_bar("https://example.com/model.bin", save_path, retries=2)
+    assert not save_path.exists()
+
+
+class MockRangeServer:
+    """
+    Serves `content` to `requests.head` and `requests.get`,
+    recording the requested ranges and the timeouts of all the requests.
+    """
+
+    def __init__(self, content: bytes, accept_ranges: bool = True, partial: bool = True) -> None:
+        self.content = content
+        self.accept_ranges = accept_ranges
+        self.partial = partial
+        self.ranges: List[Tuple[int, int]] = []
+        self.timeouts: List[Optional[float]] = []
+        self.lock = threading.Lock()
+
+    def head(self, url: str, **kwargs) -> MockResponse:
+        self.timeouts.append(kwargs.get("timeout"))
+        response = MockResponse(b"")
+        response.headers = {"content-length": str(len(self.content))}
+        if self.accept_ranges:
+            response.headers["accept-ranges"] = "bytes"
+        return response
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> MockResponse:
+        with self.lock:
+            self.timeouts.append(kwargs.get("timeout"))
+        if headers is None or "Range" not in headers:
+            return MockResponse(self.content)
+        start, end = map(int, headers["Range"][len("bytes=") :].split("-"))
+        with self.lock:
+            self.ranges.append((start, end))
+        if not self.partial:
+            # The server ignores the range and sends the whole content.
+            return MockResponse(self.content)
+        return MockResponse(self.content[start : end + 1], status_code=206)
+
+
+@pytest.fixture
+def content() -> bytes:
+    return bytes(range(256)) * 41
+
+
+def mock_server(monkeypatch, server: MockRangeServer) -> MockRangeServer:
+    monkeypatch.setattr(requests, "head", server.head)
+    monkeypatch.setattr(requests, "get", server.get)
+    monkeypatch.setattr(language_identification.time, "sleep", lambda _: None)
+    return server
+
+
+@pytest.mark.parametrize("num_connections", [2, 5, 7])
+def test_download_with_range_requests(
+    tmp_path: Path, monkeypatch, content: bytes, num_connections: int
+) -> None:
+    server = mock_server(monkeypatch, MockRangeServer(content))
+
+    save_path = tmp_path / "model.bin"
+    _download_with_range_requests("https://example.com/model.bin", save_path, num_connections)
+    assert save_path.read_bytes() == content
+    assert not (tmp_path / "model.bin.part").exists()
+
+    # The ranges cover the whole content without gaps or overlaps.
+    ranges = sorted(server.ranges)
+    assert len(ranges) == num_connections
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(content) - 1
+    assert all(prev[1] + 1 == next[0] for prev, next in zip(ranges, ranges[1:]))
+    assert server.timeouts == [REQUEST_TIMEOUT] * (num_connections + 1)
+
+
+def test_download_with_range_requests_not_accepted(
+    tmp_path: Path, monkeypatch, content: bytes
+) -> None:
+    server = mock_server(monkeypatch, MockRangeServer(content, accept_ranges=False))
+
+    save_path = tmp_path / "model.bin"
+    _download_with_range_requests("https://example.com/model.bin", save_path)
+    assert save_path.read_bytes() == content
+    assert server.ranges == []
+    assert server.timeouts == [REQUEST_TIMEOUT] * 2
+
+
+def test_download_with_range_requests_not_partial(
+    tmp_path: Path, monkeypatch, content: bytes
+) -> None:
+    mock_server(monkeypatch, MockRangeServer(content, partial=False))
+
+    save_path = tmp_path / "model.bin"
+    with pytest.raises(requests.RequestException, match="Status code: 200"):
+        _download_with_range_requests("https://example.com/model.bin", save_path)
+    assert not save_path.exists()
+    assert not (tmp_path / "model.bin.part").exists()
+
+
+def test_download_fasttext_model_fallback(tmp_path: Path, monkeypatch, content: bytes) -> None:
+    server = mock_server(monkeypatch, MockRangeServer(content, partial=False))
+
+    save_path = tmp_path / "model.bin"
+    _download_fasttext_model(save_path)
+    assert server.ranges
+    assert save_path.read_bytes() == content
+    assert not (tmp_path / "model.bin.part").exists()
@@ -1,7 +1,89 @@
 import os
 
+import mmh3
+import numpy as np
+import pytest
+
 from hojichar.core.models import Document
-from hojichar.filters.deduplication import GenerateDedupLSH, LSHDeduplicator
+from hojichar.filters.deduplication import (
+    GenerateDedupLSH,
+    LSHDeduplicator,
+    _hex4_of_fingerprints,
+    _lsh_to_key,
+    _min_murmurhash3_32,
+    _min_murmurhash3_32_batch,
+)
+
+
+@pytest.mark.parametrize("rows", [2, 1024])
+def test_min_murmurhash3_32(rows):
+    # Keys of every tail length (0 to 3 bytes) and multibyte characters.
+    keys = ["", "a", "ab", "abc", "abcd", "abcde", "ほうじ茶", "吾輩は猫で", "🍵🍵", "hojichar"]
+    seeds = np.arange(50, dtype=np.uint32)
+    expected = [min(mmh3.hash(key, seed, signed=True) for key in keys) for seed in range(50)]
+    minhash = _min_murmurhash3_32([key.encode("utf-8") for key in keys], seeds, rows=rows)
+    assert minhash.tolist() == expected
+
+
+@pytest.mark.parametrize("rows", [2, 1024])
+def test_min_murmurhash3_32_batch(rows):
+    keys_of_docs = [["abcd", "ほうじ茶", "a"], ["abcd"], ["", "efgh", "ijkl", "mnop"], ["茶"]]
+    seeds = np.arange(50, dtype=np.uint32)
+    minhash = _min_murmurhash3_32_batch(
+        [[key.encode("utf-8") for key in keys] for keys in keys_of_docs], seeds, rows=rows
+    )
+    assert minhash.shape == (len(keys_of_docs), 50)
+    for keys, doc_minhash in zip(keys_of_docs, minhash):
+        expected = [min(mmh3.hash(key, seed, signed=True) for key in keys) for seed in range(50)]
+        assert doc_minhash.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "fingerprints",
+    [[0, 1, 0xFFFF, 0x12345, 2**31 - 1], [-(2**31), -0x12345, -0x1000], [-0xFFF, -1, 5]],
+)
+def test_hex4_of_fingerprints(fingerprints):
+    expected = "".join(format(fp, "04x")[-4:] for fp in fingerprints)
+    assert _hex4_of_fingerprints(np.array(fingerprints, dtype=np.int32)) == expected
+
+
+def test_lsh_to_key_is_injective():
+    lshs = [
+        "0+00ab",
+        "0+ab",
+        "0+AB",
+        "0+a_b",
+        "0+ 0ab",
+        "0+0x00ab",
+        "00+ab",
+        "1+ab",
+        "0+-00a",
+        "0+",
+        "+ab",
+        "ab",
+        "4294967296+ab",
+        "１+ab",
+    ]
+    keys = [_lsh_to_key(lsh) for lsh in lshs]
+    assert len(set(keys)) == len(lshs)
+    assert isinstance(_lsh_to_key("12+f853f485e9c1bcbabcc880c1b8675d2c994432f4"), int)
+
+
+def test_seen_holds_lsh_strings():
+    doc = GenerateDedupLSH().apply(Document("吾輩は猫である。名前はまだ無い。"))
+    deduplicator = LSHDeduplicator()
+    deduplicator.apply(doc)
+    assert set(deduplicator.seen) == set(doc.dedup_lsh)
+    assert all(lsh in deduplicator.seen for lsh in doc.dedup_lsh)
+
+    # The seen hashes can be persisted and given to another deduplicator as strings.
+    restored = LSHDeduplicator(online_dedup=False)
+    restored.seen.update(set(deduplicator.seen))
+    assert restored.apply(GenerateDedupLSH().apply(Document(doc.text))).is_rejected
+
+    replaced = LSHDeduplicator(online_dedup=False)
+    replaced.seen = set(doc.dedup_lsh[:1])
+    assert replaced.apply(GenerateDedupLSH().apply(Document(doc.text))).is_rejected
 
 
 class TestLSHDeduplicator:
@@ -36,3 +118,12 @@ class TestLSHDeduplicator:
 
         finally:
             os.remove(self.temporary_path)
+
+
+def test_generate_dedup_lsh_apply_batch():
+    texts = ["吾輩は猫である。", "吾輩は鳥である。", "", "Hello, World.", "祇園精舎の鐘の声"]
+    generator = GenerateDedupLSH()
+    expected = [generator.apply(Document(text)).dedup_lsh for text in texts]
+    batch = generator.apply_batch([Document(text) for text in texts])
+    assert [doc.dedup_lsh for doc in batch] == expected
+    assert generator.apply_batch([]) == []
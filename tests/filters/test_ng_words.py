@@ -1,5 +1,8 @@
+import os
 import pathlib
 
+import pytest
+
 import hojichar
 from hojichar.core.models import Document
 from hojichar.filters.document_filters import NgWordsFilterEn, NgWordsFilterJa
@@ -7,8 +10,12 @@ from hojichar.filters.document_filters import NgWordsFilterEn, NgWordsFilterJa
 BASE_PATH = pathlib.Path(hojichar.__path__[0])
 
 
-def test_ng_words_filter_ja():
-    dict_path = BASE_PATH / "dict/dummy_ng_words.txt"
+@pytest.fixture(scope="module")
+def dict_path() -> pathlib.Path:
+    return BASE_PATH / "dict/dummy_ng_words.txt"
+
+
+def test_ng_words_filter_ja(dict_path: pathlib.Path) -> None:
     ng_words_filter_ja = NgWordsFilterJa(dict_path, ignore_confused=False)
     assert ng_words_filter_ja.apply(Document("ほうじ茶")).is_rejected
     assert ng_words_filter_ja.apply(Document("ほ うじ茶")).is_rejected
@@ -23,8 +30,7 @@ def test_ng_words_filter_ja():
     assert ng_words_filter_ja.apply(Document("ララーメンスープ")).is_rejected
 
 
-def test_ng_words_filter_ja_ignore_confused():
-    dict_path = BASE_PATH / "dict/dummy_ng_words.txt"
+def test_ng_words_filter_ja_ignore_confused(dict_path: pathlib.Path) -> None:
     ng_words_filter_ja = NgWordsFilterJa(dict_path, ignore_confused=True)
     assert ng_words_filter_ja.apply(Document("ほうじ茶")).is_rejected
     assert ng_words_filter_ja.apply(Document("ほ うじ茶")).is_rejected
@@ -39,8 +45,7 @@ def test_ng_words_filter_ja_ignore_confused():
     assert not ng_words_filter_ja.apply(Document("ララーメンスープ")).is_rejected
 
 
-def test_ng_words_filter_en():
-    dict_path = BASE_PATH / "dict/dummy_ng_words.txt"
+def test_ng_words_filter_en(dict_path: pathlib.Path) -> None:
     ng_words_filter_en = NgWordsFilterEn(dict_path)
     assert ng_words_filter_en.apply(Document("hojichar")).is_rejected
     assert ng_words_filter_en.apply(Document("h ojicha")).is_rejected
@@ -60,3 +65,21 @@ def test_ng_words_filter_en():
     assert ng_words_filter_en.apply(Document("He eats ramen, gyoza and fried rice.")).is_rejected
     assert ng_words_filter_en.apply(Document("Ramen is delicious.")).is_rejected
     assert not ng_words_filter_en.apply(Document("They are cameramen.")).is_rejected
+
+
+def test_ng_words_pattern_is_cached(tmp_path: pathlib.Path) -> None:
+    dict_path = tmp_path / "ng_words.txt"
+    dict_path.write_text("ほうじ茶\n", encoding="utf-8")
+    assert NgWordsFilterJa(dict_path).keyword_pat is NgWordsFilterJa(dict_path).keyword_pat
+    assert (
+        NgWordsFilterJa(dict_path).keyword_pat
+        is not NgWordsFilterJa(dict_path, ignore_confused=True).keyword_pat
+    )
+
+    # The dictionary is read again when the file is modified.
+    dict_path.write_text("ラーメン\n", encoding="utf-8")
+    stat = dict_path.stat()
+    os.utime(dict_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    ng_words_filter_ja = NgWordsFilterJa(dict_path)
+    assert ng_words_filter_ja.apply(Document("ラーメン")).is_rejected
+    assert not ng_words_filter_ja.apply(Document("ほうじ茶")).is_rejected
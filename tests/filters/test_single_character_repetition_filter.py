@@ -4,6 +4,11 @@ from hojichar import Document
 from hojichar.filters.document_filters import SingleCharacterRepetitionFilter
 
 
+@pytest.fixture(scope="module")
+def single_character_repetition_filter() -> SingleCharacterRepetitionFilter:
+    return SingleCharacterRepetitionFilter()
+
+
 @pytest.mark.parametrize(
     "input_str,is_rejected",
     [
@@ -13,8 +18,15 @@ from hojichar.filters.document_filters import SingleCharacterRepetitionFilter
         ("う" * 30, False),
         ("あいあいあいあいあいああいあいあいあいあいあ" * 30, False),
         ("", False),
+        ("あ" * 199, False),
+        ("い" * 199 + "あ" * 199, False),
+        ("あ" * 199 + "い" * 200, True),
+        ("\ud800" * 200, True),
     ],
 )
-def test_single_character_repetition_filter(input_str: str, is_rejected: bool) -> None:
-    filter = SingleCharacterRepetitionFilter()
-    assert filter.apply(Document(input_str)).is_rejected == is_rejected
+def test_single_character_repetition_filter(
+    single_character_repetition_filter: SingleCharacterRepetitionFilter,
+    input_str: str,
+    is_rejected: bool,
+) -> None:
+    assert single_character_repetition_filter.apply(Document(input_str)).is_rejected == is_rejected
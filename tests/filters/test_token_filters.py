@@ -0,0 +1,14 @@
+from hojichar.core.models import Document, Token
+from hojichar.filters.token_filters import TokenAddDebagTag
+
+
+def test_token_add_debag_tag() -> None:
+    doc = Document("")
+    doc.tokens = [Token("ほうじ"), Token("茶", is_rejected=True), Token("ちゃ")]
+    doc = TokenAddDebagTag().apply_filter(doc)
+    assert doc.get_tokens() == ["ほうじ<sep>", "ちゃ<sep>"]
+
+
+def test_token_add_debag_tag_batch() -> None:
+    tokens = TokenAddDebagTag().apply_batch([Token("ほうじ"), Token("ちゃ")])
+    assert [token.text for token in tokens] == ["ほうじ<sep>", "ちゃ<sep>"]
@@ -4,6 +4,12 @@ from hojichar import Document
 from hojichar.filters.document_filters import WordRepetitionRatioFilter
 
 
+@pytest.fixture(scope="module")
+def word_repetition_filter() -> WordRepetitionRatioFilter:
+    # The filter holds a MeCab tagger, so it is built once and shared by all the cases.
+    return WordRepetitionRatioFilter()
+
+
 @pytest.mark.parametrize(
     "input_str,is_rejected",
     [
@@ -25,6 +31,7 @@ from hojichar.filters.document_filters import WordRepetitionRatioFilter
         ("本日のランチ情報をお知らせ致します", False),
     ],
 )
-def test_word_repetition_filter(input_str: str, is_rejected: bool) -> None:
-    filter = WordRepetitionRatioFilter()
-    assert filter.apply(Document(input_str)).is_rejected == is_rejected
+def test_word_repetition_filter(
+    word_repetition_filter: WordRepetitionRatioFilter, input_str: str, is_rejected: bool
+) -> None:
+    assert word_repetition_filter.apply(Document(input_str)).is_rejected == is_rejected
@@ -1,14 +1,5 @@
-import json
-
-from hojichar import Compose, Document, Filter
-from hojichar.filters.document_filters import JSONLoader
-
-
-class JSONDumper(Filter):
-    def apply(self, document: Document) -> Document:
-        text = document.text
-        document.text = json.dumps({"text": text}, ensure_ascii=False)
-        return document
+from hojichar import Compose, Filter
+from hojichar.filters.document_filters import JSONDumper, JSONLoader
 
 
 class AddComment(Filter):
@@ -1,9 +1,12 @@
+import sys
+
 from hojichar import Compose, Filter
 
 
 class DummyPrint(Filter):
     def apply(self, document):
-        print("dummy print")
+        # `sys.stdout` is looked up on each call so that the output follows any redirection.
+        sys.stdout.write("dummy print\n")
         return document
 
 
@@ -1,50 +1,72 @@
+import io
 import json
 import subprocess
+import sys
 import tempfile
+from collections import Counter
 from pathlib import Path
 
 import pytest
 
+from hojichar import cli
+
+
+def lines(output):
+    """
+    Lines of the output as a multiset, to compare the output of multiple jobs,
+    whose order is not preserved, without hiding duplicated or missing lines.
+    """
+    return Counter(output.splitlines())
+
 
 @pytest.fixture
 def current_dir():
     return Path(__file__).parent
 
 
-def test_cli_filter_profile(current_dir):
+@pytest.fixture
+def run_cli(monkeypatch, capsysbinary):
+    """
+    Run the `hojichar` command in the test process instead of spawning a new interpreter,
+    and return the standard output as bytes.
+    `input` is bytes or a path to a file, which is streamed to the standard input.
+    """
+
+    def run(args, input):
+        stdin = open(input, "rb") if isinstance(input, Path) else io.BytesIO(input)
+        with stdin:
+            monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(stdin))
+            cli.main([str(arg) for arg in args])
+        return capsysbinary.readouterr().out
+
+    return run
+
+
+def test_cli_filter_profile(current_dir, run_cli):
     test_profile = current_dir / "fixtures/sample_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
     # test_output_err = current_dir / "fixtures/sample_out_100_stderr.txt"
 
-    result = subprocess.run(
-        ["hojichar", "-p", test_profile, "-j", "1"],
-        input=open(test_input).read(),
-        capture_output=True,
-        text=True,
-    )
-    assert result.returncode == 0
-    assert result.stdout == open(test_output).read()
+    stdout = run_cli(["-p", test_profile, "-j", "1"], test_input)
+    assert stdout == test_output.read_bytes()
 
 
 @pytest.mark.parametrize("num_jobs", [1, 2, 4, 8])
-def test_cli_filter_profile_multi_jobs(current_dir, num_jobs):
+def test_cli_filter_profile_multi_jobs(current_dir, num_jobs, run_cli):
     test_profile = current_dir / "fixtures/sample_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
     test_output_err = current_dir / "fixtures/sample_out_100_stderr.txt"
 
     with tempfile.NamedTemporaryFile("w+") as tmpf:
-        result = subprocess.run(
-            ["hojichar", "-p", test_profile, "-j", str(num_jobs), "--dump-stats", tmpf.name],
-            input=open(test_input).read(),
-            capture_output=True,
-            text=True,
+        stdout = run_cli(
+            ["-p", test_profile, "-j", str(num_jobs), "--dump-stats", tmpf.name],
+            test_input,
         )
         tmpf.seek(0)
         stats = tmpf.read()
-    assert result.returncode == 0
-    assert set(result.stdout.split("\n")) == set(open(test_output).read().split("\n"))
+    assert lines(stdout) == lines(test_output.read_bytes())
 
     result_stats = json.loads(stats).get("total_info")
     expected_stats = json.loads(open(test_output_err).read()).get("total_info")
@@ -56,122 +78,89 @@ def test_cli_filter_profile_multi_jobs(current_dir, num_jobs):
         assert val == expected_stats.get(key)
 
 
-def test_cli_factory_profile(current_dir):
+def test_cli_factory_profile(current_dir, run_cli):
     test_profile = current_dir / "fixtures/sample_args_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
 
     arg = "<hojichar>"
-    result = subprocess.run(
-        ["hojichar", "-p", test_profile, "--args", arg, "-j", "1"],
-        input=open(test_input).read(),
-        capture_output=True,
-        text=True,
-    )
+    stdout = run_cli(["-p", test_profile, "--args", arg, "-j", "1"], test_input)
 
-    assert result.returncode == 0
-    assert result.stdout == open(test_output).read()
+    assert stdout == test_output.read_bytes()
 
 
 @pytest.mark.parametrize("num_jobs", [1, 2, 4, 8])
-def test_cli_factory_profile_multi_jobs(current_dir, num_jobs):
+def test_cli_factory_profile_multi_jobs(current_dir, num_jobs, run_cli):
     test_profile = current_dir / "fixtures/sample_args_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
 
     arg = "<hojichar>"
-    result = subprocess.run(
-        ["hojichar", "-p", test_profile, "--args", arg, "-j", str(num_jobs)],
-        input=open(test_input).read(),
-        capture_output=True,
-        text=True,
-    )
+    stdout = run_cli(["-p", test_profile, "--args", arg, "-j", str(num_jobs)], test_input)
 
-    assert result.returncode == 0
-    assert set(result.stdout.split("\n")) == set(open(test_output).read().split("\n"))
+    assert lines(stdout) == lines(test_output.read_bytes())
 
 
-def test_cli_factory_profile_arg2(current_dir):
+def test_cli_factory_profile_arg2(current_dir, run_cli):
     test_profile = current_dir / "fixtures/sample_args2_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
 
     arg1 = "<hoji"
     arg2 = "char>"
-    result = subprocess.run(
-        ["hojichar", "-p", test_profile, "-j", "1", "--args", arg1, arg2],
-        input=open(test_input).read(),
-        capture_output=True,
-        text=True,
-    )
+    stdout = run_cli(["-p", test_profile, "-j", "1", "--args", arg1, arg2], test_input)
 
-    assert result.returncode == 0
-    assert result.stdout == open(test_output).read()
+    assert stdout == test_output.read_bytes()
 
 
 @pytest.mark.parametrize("num_jobs", [1, 2, 4, 8])
-def test_cli_factory_profile_arg2_multi_jobs(current_dir, num_jobs):
+def test_cli_factory_profile_arg2_multi_jobs(current_dir, num_jobs, run_cli):
     test_profile = current_dir / "fixtures/sample_args2_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
 
     arg1 = "<hoji"
     arg2 = "char>"
-    result = subprocess.run(
-        ["hojichar", "-p", test_profile, "-j", str(num_jobs), "--args", arg1, arg2],
-        input=open(test_input).read(),
-        capture_output=True,
-        text=True,
-    )
+    stdout = run_cli(["-p", test_profile, "-j", str(num_jobs), "--args", arg1, arg2], test_input)
 
-    assert result.returncode == 0
-    assert set(result.stdout.split("\n")) == set(open(test_output).read().split("\n"))
+    assert lines(stdout) == lines(test_output.read_bytes())
 
 
-def test_cli_file_output(current_dir):
+def test_cli_file_output(current_dir, run_cli):
     test_profile = current_dir / "fixtures/sample_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
 
-    with tempfile.NamedTemporaryFile("w+") as tempf:
-
-        hojichar_cmd = ["hojichar", "-p", test_profile, "-o", tempf.name, "-j", "1"]
-        process = subprocess.run(hojichar_cmd, input=open(test_input).read(), text=True)
+    with tempfile.NamedTemporaryFile("w+b") as tempf:
 
-        assert process.returncode == 0
+        run_cli(["-p", test_profile, "-o", tempf.name, "-j", "1"], test_input)
         tempf.seek(0)
         output = tempf.read()
-    assert output == open(test_output).read()
+    assert output == test_output.read_bytes()
 
 
 @pytest.mark.parametrize("num_jobs", [1, 2, 4, 8])
-def test_cli_file_output_multi_jobs(current_dir, num_jobs):
+def test_cli_file_output_multi_jobs(current_dir, num_jobs, run_cli):
     test_profile = current_dir / "fixtures/sample_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output = current_dir / "fixtures/sample_out_100.jsonl"
 
-    with tempfile.NamedTemporaryFile("w+") as tempf:
-
-        hojichar_cmd = ["hojichar", "-p", test_profile, "-o", tempf.name, "-j", str(num_jobs)]
-        process = subprocess.run(hojichar_cmd, input=open(test_input).read(), text=True)
+    with tempfile.NamedTemporaryFile("w+b") as tempf:
 
-        assert process.returncode == 0
+        run_cli(["-p", test_profile, "-o", tempf.name, "-j", str(num_jobs)], test_input)
         tempf.seek(0)
         output = tempf.read()
-    assert set(output.split("\n")) == set(open(test_output).read().split("\n"))
+    assert lines(output) == lines(test_output.read_bytes())
 
 
-def test_cli_dump_stats(current_dir):
+def test_cli_dump_stats(current_dir, run_cli):
     test_profile = current_dir / "fixtures/sample_profile.py"
     test_input = current_dir / "fixtures/sample_in_100.jsonl"
     test_output_err = current_dir / "fixtures/sample_out_100_stderr.txt"
 
     with tempfile.NamedTemporaryFile("w+") as tempf:
 
-        hojichar_cmd = ["hojichar", "-p", test_profile, "--dump-stats", tempf.name]
-        process = subprocess.run(hojichar_cmd, input=open(test_input).read(), text=True)
-
-        assert process.returncode == 0
+        run_cli(["-p", test_profile, "--dump-stats", tempf.name], test_input)
         tempf.seek(0)
         result_stats = json.loads(tempf.read()).get("total_info")
     expected_stats = json.loads(open(test_output_err).read()).get("total_info")
@@ -183,32 +172,31 @@ def test_cli_dump_stats(current_dir):
         assert val == expected_stats.get(key)
 
 
-def test_cli_error(current_dir):
+def test_cli_error(current_dir, run_cli):
     test_profile = current_dir / "fixtures/sample_raises_profile.py"
-    input = """\
+    input = b"""\
 Line1
 Line2<raise>
 Line3
 """
-    expected_output = """\
+    expected_output = b"""\
 Line1
 Line3
 """
 
-    hojichar_cmd = ["hojichar", "-p", test_profile, "-j", "1"]
-    process = subprocess.run(hojichar_cmd, input=input, capture_output=True, text=True)
-    assert process.returncode == 0
-    assert process.stdout == expected_output
+    stdout = run_cli(["-p", test_profile, "-j", "1"], input)
+    assert stdout == expected_output
 
 
 def test_cli_error_exit(current_dir):
+    # Run as a separate process to check the installed command and its exit status.
     test_profile = current_dir / "fixtures/sample_raises_profile.py"
-    input = """\
+    input = b"""\
 Line1
 Line2<raise>
 Line3
 """
 
     hojichar_cmd = ["hojichar", "-p", test_profile, "--exit-on-error", "-j", "1"]
-    process = subprocess.run(hojichar_cmd, input=input, capture_output=True, text=True)
+    process = subprocess.run(hojichar_cmd, input=input, capture_output=True)
     assert process.returncode == 1
@@ -1,19 +1,28 @@
 import io
-import json
+from types import SimpleNamespace
 
 import pytest
 
-from hojichar.utils.io_iter import fileout_from_iter, stdin_iter, stdout_from_iter
+from hojichar.utils import io_iter
+from hojichar.utils.io_iter import _join_lines, fileout_from_iter, stdin_iter, stdout_from_iter
 
+JSONL_LINES = ['{"text": "HojiChar"}'] * 10
 
-class OpenBytesIO(io.BytesIO):
-    def close(self):
-        pass
 
+class CaptureStdout:
+    """
+    Stand-in for a piped stdout. `stdout_from_iter` writes encoded chunks to `buffer`
+    when stdout is not a terminal, so the output is kept as bytes and decoded on access.
+    """
 
-class CaptureStdout(io.TextIOWrapper):
     def __init__(self):
-        super().__init__(OpenBytesIO(), encoding="utf-8", newline="", write_through=True)
+        self.buffer = io.BytesIO()
+
+    def isatty(self):
+        return False
+
+    def flush(self):
+        pass
 
     def getvalue(self):
         return self.buffer.getvalue().decode("utf-8")
@@ -23,11 +32,11 @@ class CaptureStdout(io.TextIOWrapper):
         return self.getvalue()
 
 
+# `stdin_iter` reads only the binary buffer of stdin, so the mocks provide just `buffer`.
 @pytest.fixture
 def mock_stdin(monkeypatch):  # Mock utf-8 strings into stdin.
     def _mock_stdin(test_data: str):
-        mock_buffer = io.BytesIO(test_data.encode("utf-8"))
-        mock_stdin = io.TextIOWrapper(buffer=mock_buffer, encoding="utf-8", errors="replace")
+        mock_stdin = SimpleNamespace(buffer=io.BytesIO(test_data.encode("utf-8")))
         monkeypatch.setattr("sys.stdin", mock_stdin)
 
     return _mock_stdin
@@ -36,8 +45,7 @@ def mock_stdin(monkeypatch):  # Mock utf-8 strings into stdin.
 @pytest.fixture
 def mock_stdin_bytes(monkeypatch):  # Mock bytes into stdin.
     def _mock_stdin(test_data_bytes: bytes):
-        mock_buffer = io.BytesIO(test_data_bytes)
-        mock_stdin = io.TextIOWrapper(buffer=mock_buffer, encoding="utf-8", errors="replace")
+        mock_stdin = SimpleNamespace(buffer=io.BytesIO(test_data_bytes))
         monkeypatch.setattr("sys.stdin", mock_stdin)
 
     return _mock_stdin
@@ -68,10 +76,7 @@ def capture_stdout(monkeypatch):
         ("SingleLine\n", ["SingleLine"]),
         ("SingleLine\r\n", ["SingleLine"]),
         ("SingleLine\r", ["SingleLine"]),
-        (
-            "\n".join([json.dumps({"text": "HojiChar"}) for _ in range(10)]),
-            ['{"text": "HojiChar"}' for _ in range(10)],
-        ),
+        ("\n".join(JSONL_LINES), JSONL_LINES),
     ],
 )
 def test_stdin_iter(mock_stdin, test_data, expected_output):
@@ -149,3 +154,38 @@ def test_fileout_from_iter(test_data, expected_output):
     fp = io.StringIO()
     fileout_from_iter(fp, test_data)
     assert fp.getvalue() == expected_output
+
+
+@pytest.mark.parametrize(
+    "test_data, buffer_size, expected_output",
+    [
+        (["Line1", "Line2", "Line3"], 1, ["Line1\n", "Line2\n", "Line3\n"]),
+        (["Line1", "Line2", "Line3"], 12, ["Line1\nLine2\n", "Line3\n"]),
+        (["Line1", "Line2", "Line3"], 100, ["Line1\nLine2\nLine3\n"]),
+        (["", ""], 100, ["\n\n"]),
+        ([], 100, []),
+    ],
+)
+def test_join_lines(test_data, buffer_size, expected_output):
+    assert list(_join_lines(test_data, buffer_size)) == expected_output
+
+
+def test_join_lines_flush_interval():
+    assert list(_join_lines(["Line1", "Line2"], 100, flush_interval=0)) == ["Line1\n", "Line2\n"]
+
+
+def test_stdout_from_iter_streams_to_pipe(capture_stdout, monkeypatch):
+    # Each line arrives one second after the previous one.
+    clock = iter(range(100))
+    monkeypatch.setattr(io_iter.time, "monotonic", lambda: next(clock))
+    capture = capture_stdout()
+
+    def lines():
+        yield "Line1"
+        yield "Line2"
+        # The lines are passed to the reader before the buffer is full.
+        assert capture.out == "Line1\nLine2\n"
+        yield "Line3"
+
+    stdout_from_iter(lines())
+    assert capture.out == "Line1\nLine2\nLine3\n"
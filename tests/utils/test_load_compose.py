@@ -1,5 +1,3 @@
-import os
-import shutil
 from pathlib import Path
 
 import pytest
@@ -14,7 +12,7 @@ from hojichar.utils.load_compose import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_dir() -> Path:
     mock_dir = Path(__file__).parent / "mock_profiles"
     return mock_dir
@@ -33,13 +31,10 @@ def test_load_filter_from_file_success(mock_dir):
 
 
 def test_load_module_load_another(mock_dir):
-    # HACK doctest loads *.py file and cause ModuleNotFoundError.
-    original = mock_dir / "mock_filter_load_another_module"
-    fpath = mock_dir / "mock_filter_load_another_module.py"
-    shutil.copyfile(original, fpath)
+    # The profile has no `.py` suffix, since doctest loads *.py file and cause ModuleNotFoundError.
+    fpath = mock_dir / "mock_filter_load_another_module"
     filter = load_filter_from_file(fpath)
     assert filter("") == "success"
-    os.remove(fpath)
 
 
 def test_load_filter_from_file_notimplemented(mock_dir):
@@ -112,6 +107,15 @@ def test_load_compose_factory(mock_dir):
     assert filter("") == "success"
 
 
+def test_load_compose_returns_new_filter(mock_dir):
+    fpath = mock_dir / "mock_filter_success.py"
+    filter = load_compose(fpath)
+    filter("")
+    reloaded = load_compose(fpath)
+    assert reloaded is not filter
+    assert reloaded.statistics["total_info"]["processed_num"] == 0
+
+
 def test_check_args_num_mismatch(caplog):
     _check_args_num_mismatch(3)
     assert "Warning: 3 arguments are ignored." in caplog.text